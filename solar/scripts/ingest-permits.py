@@ -15,21 +15,40 @@ Usage:
   python3 -u scripts/ingest-permits.py --tier 1,2          # Tier 1 and 2
   python3 -u scripts/ingest-permits.py --dry-run           # Count without ingesting
   python3 -u scripts/ingest-permits.py --list-cities       # Show available cities
+  python3 -u scripts/ingest-permits.py --full              # Refetch full history (watermarks only move forward)
+  python3 -u scripts/ingest-permits.py --workers 4         # Ingest 4 cities at a time
 """
 
 import os
 import sys
 import json
+import math
+import multiprocessing
+import queue
 import re
 import argparse
+import select
+import datetime
+import http.client
+import io
+import threading
+import urllib.error
 import urllib.request
 import urllib.parse
 import ssl
+import struct
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
 from pathlib import Path
 
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load env vars
 env_path = Path(__file__).parent.parent / ".env.local"
 load_dotenv(env_path)
@@ -41,8 +60,26 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     print("Error: SUPABASE_URL and SUPABASE_SERVICE_KEY must be set in .env.local")
     sys.exit(1)
 
+HEADERS = {
+    "apikey": SUPABASE_KEY,
+    "Authorization": f"Bearer {SUPABASE_KEY}",
+    "Content-Type": "application/json",
+}
+
 BATCH_SIZE = 50
+EQUIPMENT_LOOKUP_CHUNK = 100  # source_record_ids per in.() lookup (URL length)
 RATE_LIMIT = 1.0  # seconds between API requests
+LAYER_WORKERS = 4  # concurrent layer fetches for arcgis_multilayer
+LAYER_QUEUE_PAGES = 2  # pages a layer fetch may run ahead of the consumer
+# Pickling a record out to the pool and its result back costs the parent at
+# least half as much as transforming it in-process, so a third worker can't
+# help, and the gain only covers spawning workers (~0.2s importing this
+# script) on batches of around 100k records
+TRANSFORM_WORKERS = min(2, os.cpu_count() or 1)
+TRANSFORM_POOL_MIN = 100000  # records per batch; smaller batches are transformed in-process
+TRANSFORM_CHUNK_SIZE = 2048  # records per worker task
+WATERMARK_FILE = Path(__file__).parent.parent / "data" / "permit_watermarks.json"
+WATERMARK_LOOKBACK_DAYS = 28  # re-fetch window for late-published, back-dated permits
 
 
 # ---------------------------------------------------------------------------
@@ -63,6 +100,170 @@ SOLAR_FALSE_POSITIVES = re.compile(
     re.IGNORECASE
 )
 
+# Description patterns shared by the per-city transforms, compiled once at load
+BATTERY_RE = re.compile(r'storage|battery|powerwall|bess', re.IGNORECASE)
+BATTERY_KEYWORDS = ("storage", "battery", "powerwall", "bess")  # for already-lowercased text
+INVERTER_OUTPUT_KW_RE = re.compile(r'inverter\s+output\s+([\d.]+)\s*kw', re.IGNORECASE)
+LOCATION_COORDS_RE = re.compile(r'\(([-\d.]+),\s*([-\d.]+)\)')
+MW_RE = re.compile(r'(\d+(?:\.\d*)?)\s*mw', re.IGNORECASE)
+KW_DC_RE = re.compile(r'([\d.]+)\s*KW\s*DC', re.IGNORECASE)
+ZIP5_RE = re.compile(r'\d{5}')
+SIGN_PERMIT_RE = re.compile(r'\bbillboard\b|\bsign\b|\badvertis', re.IGNORECASE)
+
+# Tucson's structured description: "SYSTEM SIZE: 8140W DC • MODULES: (22) MFR: MODEL ..."
+TUCSON_SYSTEM_SIZE_RE = re.compile(r'SYSTEM\s+SIZE:\s*([\d.]+)\s*W\s*DC', re.IGNORECASE)
+TUCSON_MODULES_RE = re.compile(r'MODULES?:\s*\((\d+)\)\s*([^:\n]+?):\s*(\S+)', re.IGNORECASE)
+TUCSON_INVERTERS_RE = re.compile(r'INVERTERS?:\s*\((\d+)\)\s*([^:\n]+?):\s*(\S+)', re.IGNORECASE)
+TUCSON_RACKING_RE = re.compile(r'RACKING:\s*([^\n•]+)', re.IGNORECASE)
+TUCSON_SEE_DRAWING_RE = re.compile(r',?\s*SEE\s+DRAWING.*', re.IGNORECASE)
+
+# Virginia Beach mount type patterns, tried only when the keyword is present
+GROUND_MOUNT_RE = re.compile(r'ground\s*mount', re.IGNORECASE)
+ROOF_MOUNT_RE = re.compile(r'roof\s*mount', re.IGNORECASE)
+
+# Solar keyword gate for sources whose API filter is broader than PV
+SOLAR_KEYWORD_RE = re.compile(r'solar|photovoltaic|pv\s+(system|module|panel|array)', re.IGNORECASE)
+SOLARIUM_RE = re.compile(r'\bsolarium\b', re.IGNORECASE)
+DIGIT_RE = re.compile(r'\d')
+NON_ALNUM_RE = re.compile(r'[^a-z0-9]')
+
+# "(count) MANUFACTURER MODEL inverter" style equipment patterns
+MAKE_MODEL_INVERTER_RE = re.compile(r'([A-Z][A-Za-z]+)\s+(\S+)\s+(?:inverter|micro-?inverter)', re.IGNORECASE)
+PITTSBURGH_MODULE_RE = re.compile(
+    r'\((\d+)\)\s+([A-Z][A-Za-z\s]+?)\s*(?:\((\d+)[Ww]\))?\s*(?:solar\s+)?module', re.IGNORECASE)
+PITTSBURGH_INVERTER_RE = re.compile(
+    r'\((\d+)\)\s+([A-Z][A-Za-z\s]+?)\s+(\S+)\s*(?:micro)?inverter', re.IGNORECASE)
+NASHVILLE_BATTERY_RE = re.compile(r'powerwall|battery|energy\s+storage|ess|kwh', re.IGNORECASE)
+NASHVILLE_MODULE_RE = re.compile(
+    r'(\d+)\s*(?:x\s*)?([A-Z][A-Za-z\s]+?)\s+(\S+)\s+(?:\d+[Ww]|panel|module)', re.IGNORECASE)
+NASHVILLE_INVERTER_RE = re.compile(
+    r'(Enphase|SolarEdge|SMA|Fronius|Tesla|Generac|Huawei|GoodWe|Delta|Sungrow)\s+([A-Z0-9][\w\-\.]+)',
+    re.IGNORECASE)
+NASHVILLE_RACKING_RE = re.compile(
+    r'(Unirac|IronRidge|SnapNrack|Quick\s*Mount|Pegasus|Everest)\s+([A-Z0-9][\w\-\.]+)', re.IGNORECASE)
+PORTLAND_MODULE_RE = re.compile(
+    r'(\d+)\s*(?:x\s*)?([A-Z][A-Za-z\s]+?)\s+(\S+)\s+(\d+)[Ww]\s*(?:solar\s+)?(?:module|panel)', re.IGNORECASE)
+# Tampa tries each pattern in turn (inverter patterns paired with keywords they require)
+TAMPA_MODULE_RES = (
+    re.compile(r'\((\d+)\)\s+([A-Z][A-Za-z\s]+?)\s+(\S+)\s+(\d+)[Ww]\s*(?:solar\s+)?(?:module|panel)?',
+               re.IGNORECASE),
+    re.compile(r'(\d+)\s+([A-Z][A-Za-z\s]+?)\s+(\S+)\s+(\d+)[Ww]', re.IGNORECASE),
+)
+TAMPA_INVERTER_RES = (
+    (MAKE_MODEL_INVERTER_RE, ("inverter",)),
+    (re.compile(r'([A-Z][A-Za-z]+)\s+(\S+)\s+\d+(?:\.\d*)?\s*kw\s*\(?AC', re.IGNORECASE), ("kw",)),
+)
+VIRGINIA_BEACH_MODULE_RE = re.compile(
+    r'\((\d+)\)\s+([A-Z][A-Za-z\s]+?)\s+(\S+)\s+(\d+)[Ww]\s*(?:solar\s+)?module', re.IGNORECASE)
+VIRGINIA_BEACH_INVERTER_RE = re.compile(
+    r'(?:\((\d+)\)\s+)?([A-Z][A-Za-z]+(?:Edge)?)\s+(\S+)\s*(?:micro)?inverter', re.IGNORECASE)
+BOSTON_SOLAR_KEYWORD_RE = re.compile(r'solar|photovoltaic|pv\s+(system|module|panel)', re.IGNORECASE)
+
+# San Diego County's USE field: "TOTAL SYSTEM SIZE IN KILOWATTS: 7.2 ... NO. OF MODULES: 18"
+SAN_DIEGO_SOLAR_RE = re.compile(r'solar|photovoltaic|pv', re.IGNORECASE)
+SAN_DIEGO_SYSTEM_SIZE_RE = re.compile(
+    r'TOTAL\s+SYSTEM\s+SIZE\s+(?:IN\s+)?KILOWATTS?\s*:?\s*([\d,]+\.?\d*)', re.IGNORECASE)
+SAN_DIEGO_MW_RE = re.compile(r'([\d,]+(?:\.\d*)?)\s*MW', re.IGNORECASE)
+SAN_DIEGO_MODULES_RE = re.compile(r'NO\.?\s*OF\s+MODULES?\s*:?\s*(\d+)', re.IGNORECASE)
+SAN_DIEGO_INVERTERS_RE = re.compile(r'NO\.?\s*OF\s+INVERTERS?\s*:?\s*(\d+)', re.IGNORECASE)
+
+# Sacramento County inverter "<brand> <model>" patterns, keyed by brand
+SACRAMENTO_COUNTY_INVERTER_MODEL_RES = {
+    mfr: re.compile(re.escape(mfr) + r'\s+(\S+)', re.IGNORECASE)
+    for mfr in ("SolarEdge", "Enphase", "SMA", "Fronius", "ABB", "Generac", "Tesla", "Delta")
+}
+
+# Candidate field names tried in order by transform_generic_socrata
+GENERIC_PERMIT_FIELDS = (
+    "permit_number", "permit_num", "permitnum", "permitnumber", "permitno", "permit_no",
+    "permit_", "permit", "id", "permit_id", "application_number", "applicationnumber",
+    "record_number", "case_number", "file_number", "permit_case_id", "permit_tracking_id",
+    "objectid",
+)
+GENERIC_DESC_FIELDS = (
+    "description", "work_description", "work_desc", "permit_description", "permitdescription",
+    "scope_of_work", "project_description", "projectdesc", "workdescription", "work",
+    "case_name",
+)
+GENERIC_ADDRESS_FIELDS = (
+    "address", "street_address", "site_address", "location_address", "original_address1",
+    "originaladdress1", "primary_address", "project_address", "property_address",
+    "propertyaddress", "full_address", "siteaddress",
+)
+GENERIC_CITY_FIELDS = (
+    "city", "original_city", "originalcity", "site_city", "mailing_city", "parceladdresscity",
+    "propertycity", "city_town",
+)
+GENERIC_ZIP_FIELDS = (
+    "zip_code", "zipcode", "zip", "original_zip", "originalzip", "site_zip", "postal_code",
+    "parceladdresszip", "propertyzip",
+)
+GENERIC_DATE_FIELDS = (
+    "issue_date", "issued_date", "issueddate", "permit_issued_date", "date_issued", "issuedate",
+    "issuance_date", "permit_issuance_date", "permitissuedate", "applied_date", "applied",
+)
+GENERIC_INSTALLER_FIELDS = (
+    "contractor_name", "contractor", "contractor_company_desc", "contact_1_name",
+    "applicant_name", "firm_name", "company_name", "companyname", "professionalname",
+)
+GENERIC_COST_FIELDS = (
+    "project_valuation", "estimated_cost", "valuation", "valuationtotal", "value", "total_cost",
+    "reported_cost", "job_value", "jobvalue", "estimated_job_cost", "estprojectcostdec",
+    "construction_value", "buildingvaluation", "declvltn", "amount", "fee",
+)
+GENERIC_OWNER_FIELDS = (
+    "owner_name", "property_owner_name", "owner", "ownername", "property_owner",
+    "owner_company_name",
+)
+
+# Denver/Boulder permit city -> county, first substring match wins
+DENVER_CITY_COUNTIES = (
+    ("BOULDER", "BOULDER"), ("DENVER", "DENVER"), ("AURORA", "ARAPAHOE"),
+    ("LAKEWOOD", "JEFFERSON"), ("GOLDEN", "JEFFERSON"), ("BROOMFIELD", "BROOMFIELD"),
+    ("LONGMONT", "BOULDER"), ("ERIE", "BOULDER"), ("LOUISVILLE", "BOULDER"),
+)
+denver_county_cache = {}  # raw city value -> county (or None)
+
+# Manufacturer name lists as (name, lowercased) pairs, checked in order
+PHILLY_PANEL_MANUFACTURERS = tuple((m, m.lower()) for m in (
+    "JA Solar", "Canadian Solar", "Hanwha", "Qcells", "Q CELLS", "REC", "LG",
+    "SunPower", "Trina", "LONGi", "Jinko", "Silfab", "Mission Solar", "Panasonic",
+    "Solaria", "Axitec", "Aptos", "Meyer Burger", "Maxeon",
+))
+PANEL_MANUFACTURERS = tuple((m, m.lower()) for m in (
+    "Qcells", "Q CELLS", "Canadian Solar", "JA Solar", "Hanwha", "REC", "LG",
+    "SunPower", "Trina", "LONGi", "Jinko", "Silfab", "Mission Solar", "Panasonic",
+    "Solaria", "Axitec", "Aptos", "Maxeon", "Tesla",
+))
+RIVERSIDE_PANEL_MANUFACTURERS = tuple((m, m.lower()) for m in (
+    "Qcells", "Q CELLS", "Canadian Solar", "JA Solar", "Hanwha", "REC", "LG",
+    "SunPower", "Trina", "LONGi", "Jinko", "Silfab", "Mission Solar", "Panasonic",
+    "Solaria", "Axitec", "Aptos", "Maxeon",
+))
+INVERTER_MANUFACTURERS = tuple((m, m.lower()) for m in (
+    "SolarEdge", "Enphase", "SMA", "Fronius", "ABB", "Generac", "Tesla",
+))
+SACRAMENTO_COUNTY_INVERTER_MANUFACTURERS = INVERTER_MANUFACTURERS + (("Delta", "delta"),)
+PITTSBURGH_PANEL_MANUFACTURERS = tuple((m, m.lower()) for m in (
+    "JA Solar", "Canadian Solar", "Hanwha", "Qcells", "Q CELLS", "REC", "LG",
+    "SunPower", "Trina", "LONGi", "Jinko", "Silfab", "Mission Solar", "Panasonic",
+    "Solaria", "Axitec", "Aptos", "Maxeon",
+))
+VIRGINIA_BEACH_PANEL_MANUFACTURERS = tuple((m, m.lower()) for m in (
+    "REC", "JA Solar", "Canadian Solar", "Hanwha", "Qcells", "Q CELLS", "LG",
+    "SunPower", "Trina", "LONGi", "Jinko", "Silfab", "Mission Solar", "Panasonic",
+    "Solaria", "Axitec", "Aptos", "Maxeon",
+))
+
+# "<brand>: <model>" / "<brand> <model>" patterns for the Pittsburgh and Virginia Beach
+# fallbacks, keyed by brand. MODEL_AFTER_RE is the same tail, anchored right after a brand
+# found with str.find; the per-brand patterns are only needed for non-ASCII descriptions.
+MODEL_AFTER_RE = re.compile(r'[\s:]+(\S+)')
+MANUFACTURER_MODEL_RES = {
+    name: re.compile(re.escape(name) + r'[\s:]+(\S+)', re.IGNORECASE)
+    for name, _ in PITTSBURGH_PANEL_MANUFACTURERS + INVERTER_MANUFACTURERS
+}
+
 CITIES = {
     # =========================================================================
     # TIER 0: Rich datasets with new platform handlers (ArcGIS, Carto, CKAN)
@@ -333,6 +534,7 @@ CITIES = {
         "base_url": "https://data.honolulu.gov/resource/4vab-c87q.json",
         "page_size": 1000,
         "filter": "$where=solarvpinstallation='Y' AND commercialresidential='Commercial'",
+        "date_field": "issuedate",
         "prefix": "permit_honolulu",
         "transform": "honolulu",
     },
@@ -344,6 +546,7 @@ CITIES = {
         "base_url": "https://data.cityofnewyork.us/resource/ipu4-2q9a.json",
         "page_size": 1000,
         "filter": "$where=UPPER(permittee_s_business_name) LIKE '%25SOLAR%25'",
+        "date_field": "issuance_date",
         "prefix": "permit_nyc",
         "transform": "nyc",
     },
@@ -360,6 +563,7 @@ CITIES = {
         "base_url": "https://data.sfgov.org/resource/i98e-djp9.json",
         "page_size": 1000,
         "filter": f"$where={SOLAR_WHERE}",
+        "date_field": "issued_date",
         "prefix": "permit_sf",
         "transform": "sf",
     },
@@ -372,6 +576,7 @@ CITIES = {
         "base_url": "https://data.lacity.org/resource/pi9x-tg5x.json",
         "page_size": 1000,
         "filter": f"$where={SOLAR_WHERE.replace('description', 'work_desc')}",
+        "date_field": "issue_date",
         "prefix": "permit_la",
         "transform": "la",
     },
@@ -384,6 +589,7 @@ CITIES = {
         "base_url": "https://data.cityofchicago.org/resource/ydr8-5enu.json",
         "page_size": 1000,
         "filter": f"$where={SOLAR_WHERE.replace('description', 'work_description')}",
+        "date_field": "issue_date",
         "prefix": "permit_chicago",
         "transform": "chicago",
     },
@@ -396,6 +602,7 @@ CITIES = {
         "base_url": "https://data.austintexas.gov/resource/3syk-w9eu.json",
         "page_size": 1000,
         "filter": "$where=lower(description) LIKE '%25solar%25' AND permittype='EP'",
+        "date_field": "issue_date",
         "prefix": "permit_austin",
         "transform": "austin",
     },
@@ -408,6 +615,7 @@ CITIES = {
         "base_url": "https://data.seattle.gov/resource/76t5-zqzr.json",
         "page_size": 1000,
         "filter": f"$where={SOLAR_WHERE}",
+        "date_field": "issue_date",
         "prefix": "permit_seattle",
         "transform": "seattle",
     },
@@ -432,6 +640,7 @@ CITIES = {
         "base_url": "https://data.kcmo.org/resource/ntw8-aacc.json",
         "page_size": 1000,
         "filter": f"$where={SOLAR_WHERE}",
+        "date_field": "issuedate",
         "prefix": "permit_kc",
         "transform": "kansas_city",
     },
@@ -444,6 +653,7 @@ CITIES = {
         "base_url": "https://data.cityoforlando.net/resource/ryhf-m453.json",
         "page_size": 1000,
         "filter": "$where=UPPER(project_name) LIKE '%25SOLAR%25'",
+        "date_field": "issue_date",
         "prefix": "permit_orlando",
         "transform": "orlando",
     },
@@ -456,6 +666,7 @@ CITIES = {
         "base_url": "https://data.brla.gov/resource/7fq7-8j7r.json",
         "page_size": 1000,
         "filter": "$where=UPPER(projectdescription) LIKE '%25SOLAR%25'",
+        "date_field": "issueddate",
         "prefix": "permit_batonrouge",
         "transform": "baton_rouge",
     },
@@ -509,6 +720,7 @@ CITIES = {
         "base_url": "https://data.sandiegocounty.gov/resource/dyzh-7eat.json",
         "page_size": 1000,
         "filter": "$where=primary_scope_code LIKE '8004%25'",
+        "date_field": "issued_date",
         "prefix": "permit_sdcounty",
         "transform": "san_diego_county",
         "has_equipment": True,
@@ -971,6 +1183,7 @@ CITIES = {
         "base_url": "https://data.texas.gov/resource/82ee-gbj5.json",
         "page_size": 1000,
         "filter": "$where=UPPER(permittypedescr) LIKE '%25SOLAR%25'",
+        "date_field": "permitissueddate",
         "prefix": "permit_collintx",
         "transform": "collin_county",
     },
@@ -1011,6 +1224,7 @@ CITIES = {
         "base_url": "https://data.cincinnati-oh.gov/resource/cfkj-xb9y.json",
         "page_size": 1000,
         "filter": "$where=UPPER(companyname) LIKE '%25SOLAR%25' OR UPPER(companyname) LIKE '%25SUNRUN%25' OR UPPER(companyname) LIKE '%25TESLA%25' OR UPPER(companyname) LIKE '%25PHOTOVOLTAIC%25'",
+        "date_field": "issueddate",
         "prefix": "permit_cincinnati",
         "transform": "cincinnati",
     },
@@ -1032,6 +1246,9 @@ CITIES = {
         "platform": "socrata",
         "base_url": "https://data.virginia.gov/resource/8f983ea2-1e38-4281-ad26-f6477a3a4966.json",
         "page_size": 1000,
+        # No server-side filter: the energy type column varies (energy_type/type)
+        # and transform_virginia_deq keeps photovoltaic-only rows that $q=solar
+        # would miss
         "filter": "",
         "prefix": "vadeq",
         "transform": "virginia_deq",
@@ -1073,34 +1290,158 @@ CITIES = {
 }
 
 
+# ---------------------------------------------------------------------------
+# HTTP helpers
+# ---------------------------------------------------------------------------
+
+USER_AGENT = f"Python-urllib/{urllib.request.__version__}"
+MAX_REDIRECTS = 10
+IDEMPOTENT_METHODS = ("GET", "HEAD")  # safe to resend after a dropped connection
+PROXIES = urllib.request.getproxies()  # HTTP(S)_PROXY from the environment / .env.local
+
+# Shared by portals with broken certificate chains (config "ssl_no_verify").
+# Built once: creating a context loads the CA bundle from disk.
+INSECURE_SSL_CONTEXT = ssl.create_default_context()
+INSECURE_SSL_CONTEXT.check_hostname = False
+INSECURE_SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+
+# Keep-alive connections, one per (scheme, host) per thread, so paging through
+# a portal or batching Supabase inserts reuses a single TCP/TLS session
+# instead of handshaking on every request.
+_connections = threading.local()
+
+
+def _get_connection(scheme, netloc, timeout, context):
+    pool = getattr(_connections, "pool", None)
+    if pool is None:
+        pool = _connections.pool = {}
+    key = (scheme, netloc, context)
+    conn = pool.get(key)
+    if conn is None:
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(netloc, timeout=timeout, context=context)
+        else:
+            conn = http.client.HTTPConnection(netloc, timeout=timeout)
+        pool[key] = conn
+    elif conn.timeout != timeout:
+        conn.timeout = timeout
+        if conn.sock:
+            conn.sock.settimeout(timeout)
+    return conn
+
+
+def _connection_dropped(conn):
+    """True if the server has closed (or written to) an idle keep-alive connection.
+
+    An idle socket should have nothing to read; if it is readable the server
+    has sent EOF, so the connection must not carry another request.
+    """
+    try:
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+def _uses_proxy(parts):
+    """True if PROXIES has a proxy for this URL's scheme and NO_PROXY doesn't exempt its host."""
+    return parts.scheme in PROXIES and not urllib.request.proxy_bypass(parts.netloc)
+
+
+def _urlopen(url, data, headers, method, timeout, context):
+    """Send a request with urllib, which routes it through the configured proxy."""
+    req = urllib.request.Request(url, data=data, headers=headers, method=method)
+    with urllib.request.urlopen(req, timeout=timeout, context=context) as resp:
+        return resp.read()
+
+
+def http_request(url, params=None, data=None, headers=None, method=None, timeout=None, context=None):
+    """Send a request over a reused keep-alive connection and return the body bytes.
+
+    Behaves like urllib.request.urlopen: follows redirects, raises HTTPError
+    (with a readable body) for non-2xx responses and URLError on connection
+    failures. `params` are encoded in one pass, leaving PostgREST filter
+    syntax (`.*,()`) unescaped.
+
+    A dropped keep-alive connection is retried only for GET/HEAD; other
+    methods get a fresh connection when the idle one has been closed, but
+    are never resent. URLs that need a proxy go through urllib instead.
+    """
+    if params:
+        url += "?" + urllib.parse.urlencode(params, safe=".*,()", quote_via=urllib.parse.quote)
+    method = method or ("GET" if data is None else "POST")
+    headers = {"User-Agent": USER_AGENT, **(headers or {})}
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        if PROXIES and _uses_proxy(parts):
+            return _urlopen(url, data, headers, method, timeout, context)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        conn = _get_connection(parts.scheme, parts.netloc, timeout, context)
+        if conn.sock is not None and method not in IDEMPOTENT_METHODS and _connection_dropped(conn):
+            conn.close()
+        for attempt in range(2):
+            reused = conn.sock is not None
+            try:
+                conn.request(method, path, body=data, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                conn.close()
+                # Server dropped an idle keep-alive connection — retry once on a
+                # fresh one, unless the request may already have been acted on
+                if reused and attempt == 0 and method in IDEMPOTENT_METHODS:
+                    continue
+                raise urllib.error.URLError(e)
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                raise urllib.error.URLError(e)
+        if resp.will_close:
+            conn.close()
+
+        location = resp.getheader("Location")
+        if resp.status in (301, 302, 303, 307, 308) and location:
+            if method not in ("GET", "HEAD"):
+                if resp.status in (307, 308):
+                    raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(body))
+                # Same as urllib: a redirected POST is retried as a bodiless GET
+                method, data = "GET", None
+                headers = {k: v for k, v in headers.items() if k.lower() != "content-type"}
+            url = urllib.parse.urljoin(url, location)
+            continue
+        if not 200 <= resp.status < 300:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(body))
+        return body
+    raise urllib.error.HTTPError(url, resp.status, "Too many redirects", resp.headers, io.BytesIO(body))
+
+
+def json_loads(body):
+    """Parse a JSON response body, with orjson when it is installed.
+
+    Bodies orjson rejects (NaN literals, integers past 64 bits) go through
+    the stdlib parser, which also produces the error for invalid JSON.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(body)
+
+
 # ---------------------------------------------------------------------------
 # Supabase helpers
 # ---------------------------------------------------------------------------
 
 def supabase_get(table, params):
     url = f"{SUPABASE_URL}/rest/v1/{table}"
-    if params:
-        url += "?" + "&".join(
-            f"{k}={urllib.parse.quote(str(v), safe='.*,()')}" for k, v in params.items()
-        )
-    headers = {
-        "apikey": SUPABASE_KEY,
-        "Authorization": f"Bearer {SUPABASE_KEY}",
-    }
-    req = urllib.request.Request(url, headers=headers)
-    with urllib.request.urlopen(req) as resp:
-        return json.loads(resp.read().decode())
+    return json_loads(http_request(url, params=params, headers=HEADERS))
 
 
 def supabase_post(table, records):
     """POST batch of records with ignore-duplicates."""
     url = f"{SUPABASE_URL}/rest/v1/{table}"
-    headers = {
-        "apikey": SUPABASE_KEY,
-        "Authorization": f"Bearer {SUPABASE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "resolution=ignore-duplicates,return=minimal",
-    }
+    headers = {**HEADERS, "Prefer": "resolution=ignore-duplicates,return=minimal"}
     try:
         body = json.dumps(records, allow_nan=False).encode()
     except ValueError:
@@ -1111,10 +1452,9 @@ def supabase_post(table, records):
                 if isinstance(v, float) and (math.isnan(v) or math.isinf(v)):
                     r[k] = None
         body = json.dumps(records).encode()
-    req = urllib.request.Request(url, data=body, headers=headers, method="POST")
     try:
-        with urllib.request.urlopen(req) as resp:
-            return True, None
+        http_request(url, data=body, headers=headers, method="POST")
+        return True, None
     except Exception as e:
         err_body = ""
         if hasattr(e, 'read'):
@@ -1125,6 +1465,11 @@ def supabase_post(table, records):
         return False, f"{e} | {err_body}" if err_body else str(e)
 
 
+def postgrest_quote(value):
+    """Double-quote a value for a PostgREST in.(...) list (IDs may contain commas)."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
 def get_existing_source_ids(prefix):
     """Get existing source_record_ids with given prefix."""
     existing = set()
@@ -1146,23 +1491,38 @@ def get_existing_source_ids(prefix):
     return existing
 
 
+data_source_cache = {}  # name -> id, stable for the whole run
+data_source_preloaded = False
+data_source_lock = threading.Lock()  # --workers cities look up sources concurrently
+
+
 def get_data_source_id(name):
-    """Get or create data source ID."""
-    rows = supabase_get("solar_data_sources", {"name": f"eq.{name}", "select": "id"})
-    if rows:
-        return rows[0]["id"]
-    url = f"{SUPABASE_URL}/rest/v1/solar_data_sources"
-    headers = {
-        "apikey": SUPABASE_KEY,
-        "Authorization": f"Bearer {SUPABASE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation",
-    }
-    body = json.dumps({"name": name, "url": "Municipal permit open data portal"}).encode()
-    req = urllib.request.Request(url, data=body, headers=headers, method="POST")
-    with urllib.request.urlopen(req) as resp:
-        data = json.loads(resp.read().decode())
-        return data[0]["id"] if isinstance(data, list) else data["id"]
+    """Get or create data source ID.
+
+    All existing municipal permit sources are loaded with one request on
+    first use; later lookups are served from data_source_cache. Both the
+    lookup and the create go over the shared keep-alive Supabase
+    connection, so a new source costs no extra handshake. The lock keeps
+    parallel cities from repeating the preload or creating a source twice.
+    """
+    global data_source_preloaded
+    with data_source_lock:
+        if not data_source_preloaded:
+            for r in supabase_get("solar_data_sources", {"select": "id,name", "name": "like.municipal_permits_*"}):
+                data_source_cache[r["name"]] = r["id"]
+            data_source_preloaded = True
+        if name in data_source_cache:
+            return data_source_cache[name]
+        rows = supabase_get("solar_data_sources", {"name": f"eq.{name}", "select": "id"})
+        if rows:
+            data_source_cache[name] = rows[0]["id"]
+            return rows[0]["id"]
+        url = f"{SUPABASE_URL}/rest/v1/solar_data_sources"
+        headers = {**HEADERS, "Prefer": "return=representation"}
+        body = json.dumps({"name": name, "url": "Municipal permit open data portal"}).encode()
+        data = json_loads(http_request(url, data=body, headers=headers, method="POST"))
+        data_source_cache[name] = data[0]["id"] if isinstance(data, list) else data["id"]
+        return data_source_cache[name]
 
 
 # ---------------------------------------------------------------------------
@@ -1170,20 +1530,21 @@ def get_data_source_id(name):
 # ---------------------------------------------------------------------------
 
 def fetch_opendatasoft(config):
-    """Fetch all records from OpenDataSoft API."""
-    records = []
+    """Yield pages of records from OpenDataSoft API.
+
+    Returns True once the last page has been fetched (the API errors raise).
+    """
     offset = 0
     while True:
         url = f"{config['base_url']}?limit={config['page_size']}&offset={offset}"
         if config.get("filter"):
             url += "&" + config["filter"]
-        req = urllib.request.Request(url)
-        with urllib.request.urlopen(req) as resp:
-            data = json.loads(resp.read().decode())
+        data = json_loads(http_request(url))
         # v2.1 API uses "results", v2 uses "records"
         batch = data.get("results", data.get("records", []))
         if not batch:
             break
+        records = []
         for rec in batch:
             # v2.1: flat record, v2: nested under record.fields
             if "record" in rec and "fields" in rec.get("record", {}):
@@ -1195,54 +1556,110 @@ def fetch_opendatasoft(config):
             records.append(fields)
         offset += len(batch)
         total = data.get("total_count", 0)
+        # Don't hold the raw response while the caller works through the page
+        del data, batch
+        yield records
         if offset % 500 == 0 or offset >= total:
             print(f"    Fetched {offset}/{total}...")
         if offset >= total:
             break
         time.sleep(RATE_LIMIT)
-    return records
+    return True
 
 
 def fetch_socrata(config):
-    """Fetch all records from Socrata SODA API."""
-    records = []
+    """Yield pages of records from Socrata SODA API.
+
+    Returns True once the last page has been fetched, or False if an API
+    error cut the fetch short (the pages already yielded stand).
+    """
     offset = 0
+    # Only $offset changes between pages, so encode the (long) SoQL filter once
+    safe_chars = "$=&%'()<>,"
+    encoded_filter = urllib.parse.quote(config["filter"], safe=safe_chars) if config.get("filter") else ""
     while True:
-        params = f"$limit={config['page_size']}&$offset={offset}"
-        if config.get("filter"):
-            params += "&" + config["filter"]
-        safe_chars = "$=&%'()<>,"
-        url = f"{config['base_url']}?{urllib.parse.quote(params, safe=safe_chars)}"
-        req = urllib.request.Request(url, headers={"User-Agent": "SolarTrack/1.0"})
+        url = f"{config['base_url']}?$limit={config['page_size']}&$offset={offset}"
+        if encoded_filter:
+            url += "&" + encoded_filter
         try:
-            with urllib.request.urlopen(req) as resp:
-                data = json.loads(resp.read().decode())
+            data = json_loads(http_request(url, headers={"User-Agent": "SolarTrack/1.0"}))
         except Exception as e:
             print(f"    API error at offset {offset}: {e}")
-            break
+            return False
         if not data:
             break
-        records.extend(data)
+        yield data
         offset += len(data)
         if offset % 1000 == 0:
             print(f"    Fetched {offset}...")
         if len(data) < config["page_size"]:
             break
         time.sleep(RATE_LIMIT)
-    return records
+    return True
+
+
+class OidBitmap:
+    """Set of ArcGIS OBJECTIDs stored as one bit per id.
+
+    OBJECTIDs are dense positive ints, so a growable bit array costs ~125KB per
+    million ids where a set of ints costs tens of MB. Anything that is not a
+    small non-negative int falls back to a plain set.
+    """
+    MAX_BITS = 1 << 28  # 32MB ceiling
+
+    def __init__(self):
+        self.bits = bytearray()
+        self.other = set()
+
+    def __contains__(self, oid):
+        if type(oid) is int and 0 <= oid < self.MAX_BITS:
+            i = oid >> 3
+            return i < len(self.bits) and bool(self.bits[i] & (1 << (oid & 7)))
+        return oid in self.other
+
+    def add(self, oid):
+        if type(oid) is int and 0 <= oid < self.MAX_BITS:
+            i = oid >> 3
+            if i >= len(self.bits):
+                # Grow geometrically so sequential ids don't resize every page
+                self.bits.extend(bytes(max(i + 1 - len(self.bits), len(self.bits))))
+            self.bits[i] |= 1 << (oid & 7)
+        else:
+            self.other.add(oid)
 
 
-def fetch_arcgis(config):
-    """Fetch all records from ArcGIS FeatureServer/MapServer REST API.
+class RateLimiter:
+    """Spaces requests made from several threads at least `interval` seconds apart."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next_time = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_time)
+            self.next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def fetch_arcgis(config, rate_limiter=None):
+    """Yield pages of records from ArcGIS FeatureServer/MapServer REST API.
 
     Uses offset-based pagination for FeatureServer, and OBJECTID-based
     pagination for older MapServer endpoints that ignore resultOffset.
+    Returns False if an API error cut the fetch short, True otherwise.
+
+    A shared rate_limiter replaces the RATE_LIMIT sleep between pages, so
+    parallel fetches against one host keep to one request per interval.
     """
-    records = []
+    fetched = 0
     offset = 0
     use_oid_paging = config.get("oid_paging", False)
     last_oid = 0
-    seen_oids = set()
+    seen_oids = OidBitmap()
 
     while True:
         where = config.get("filter", "1=1")
@@ -1263,23 +1680,19 @@ def fetch_arcgis(config):
             params["outSR"] = config["out_sr"]
 
         url = f"{config['base_url']}/query?{urllib.parse.urlencode(params)}"
-        req = urllib.request.Request(url)
+        if rate_limiter is not None:
+            rate_limiter.wait()
         try:
-            ctx = None
-            if config.get("ssl_no_verify"):
-                ctx = ssl.create_default_context()
-                ctx.check_hostname = False
-                ctx.verify_mode = ssl.CERT_NONE
-            with urllib.request.urlopen(req, context=ctx) as resp:
-                data = json.loads(resp.read().decode())
+            ctx = INSECURE_SSL_CONTEXT if config.get("ssl_no_verify") else None
+            data = json_loads(http_request(url, context=ctx))
         except Exception as e:
             print(f"    API error at offset {offset}: {e}")
-            break
+            return False
         features = data.get("features", [])
         if not features:
             break
 
-        new_count = 0
+        records = []
         for feat in features:
             rec = feat.get("attributes", {})
             oid = rec.get("OBJECTID") or rec.get("ObjectId") or rec.get("objectid")
@@ -1299,44 +1712,100 @@ def fetch_arcgis(config):
                     # Polygon geometry — compute centroid from first ring
                     ring = geo["rings"][0] if geo["rings"] else []
                     if ring:
-                        xs = [p[0] for p in ring]
-                        ys = [p[1] for p in ring]
-                        rec["_lng"] = sum(xs) / len(xs)
-                        rec["_lat"] = sum(ys) / len(ys)
+                        # Single pass over the vertices, no per-ring coordinate lists
+                        sum_x = sum_y = 0.0
+                        for p in ring:
+                            sum_x += p[0]
+                            sum_y += p[1]
+                        rec["_lng"] = sum_x / len(ring)
+                        rec["_lat"] = sum_y / len(ring)
             records.append(rec)
-            new_count += 1
 
         offset += len(features)
-        if offset % 1000 == 0 or new_count == 0:
-            print(f"    Fetched {len(records)}...")
+        fetched += len(records)
+        if offset % 1000 == 0 or not records:
+            print(f"    Fetched {fetched}...")
 
         # Stop if no new records (dedup caught all — server is looping)
-        if new_count == 0:
+        if not records:
             break
-        if not data.get("exceededTransferLimit", False) and len(features) < config["page_size"]:
+        last_page = not data.get("exceededTransferLimit", False) and len(features) < config["page_size"]
+        # Drop the raw features (and their geometry rings) before handing the page out
+        del data, features
+        yield records
+        if last_page:
             break
-        time.sleep(RATE_LIMIT)
-    return records
+        if rate_limiter is None:
+            time.sleep(RATE_LIMIT)
+    return True
 
 
 def fetch_arcgis_multilayer(config):
-    """Fetch from multiple ArcGIS FeatureServer layers and combine."""
-    all_records = []
+    """Yield pages from multiple ArcGIS FeatureServer layers.
+
+    Layers are independent queries, so they are fetched in parallel and
+    yielded in layer order. All layers share one RateLimiter, since they hit
+    the same host, and each may run at most LAYER_QUEUE_PAGES pages ahead of
+    the consumer. Returns True only if every layer was fetched completely.
+    """
     base = config["base_url"]  # e.g., .../FeatureServer (no layer suffix)
     layers = config.get("layers", [0])
-    for layer_id in layers:
-        layer_config = dict(config)
-        layer_config["base_url"] = f"{base}/{layer_id}"
-        print(f"    Layer {layer_id}...")
-        records = fetch_arcgis(layer_config)
-        print(f"      {len(records)} records from layer {layer_id}")
-        all_records.extend(records)
-    return all_records
+    print(f"    Layers {', '.join(str(l) for l in layers)}...")
+    output = getattr(city_output, "buffer", None)
+    rate_limiter = RateLimiter(RATE_LIMIT)
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=LAYER_QUEUE_PAGES) for _ in layers]
+    executor = ThreadPoolExecutor(max_workers=max(1, min(LAYER_WORKERS, len(layers))))
+    try:
+        futures = [
+            executor.submit(with_city_output, output, pump_pages,
+                            fetch_arcgis({**config, "base_url": f"{base}/{layer_id}"}, rate_limiter),
+                            pages, stop)
+            for layer_id, pages in zip(layers, queues)
+        ]
+        complete = True
+        for layer_id, pages, future in zip(layers, queues, futures):
+            count = 0
+            while True:
+                page, layer_complete = pages.get()
+                if page is None:
+                    break
+                count += len(page)
+                yield page
+            future.result()  # re-raise anything the layer fetch raised
+            complete = complete and layer_complete
+            print(f"      {count} records from layer {layer_id}")
+    finally:
+        # Lets blocked layer fetches give up if the consumer stops early
+        stop.set()
+        executor.shutdown()
+    return complete
+
+
+def put_unless_stopped(pages, item, stop):
+    """Put item on the bounded queue pages, waiting for room until stop is set."""
+    while not stop.is_set():
+        try:
+            pages.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def pump_pages(fetcher, pages, stop):
+    """Feed a fetcher's pages into pages as (page, None), then (None, complete)."""
+    status = {}
+    try:
+        for page in track_fetch(fetcher, status):
+            if not put_unless_stopped(pages, (page, None), stop):
+                return
+    finally:
+        put_unless_stopped(pages, (None, status.get("complete", False)), stop)
 
 
 def fetch_carto(config):
-    """Fetch all records from CARTO SQL API."""
-    records = []
+    """Yield pages of records from CARTO SQL API."""
     offset = 0
     while True:
         where = config.get("filter", "1=1")
@@ -1344,34 +1813,33 @@ def fetch_carto(config):
         sql = f"SELECT * FROM {table} WHERE {where} LIMIT {config['page_size']} OFFSET {offset}"
         params = urllib.parse.urlencode({"q": sql, "format": "json"})
         url = f"{config['base_url']}?{params}"
-        req = urllib.request.Request(url)
         try:
-            with urllib.request.urlopen(req) as resp:
-                data = json.loads(resp.read().decode())
+            data = json_loads(http_request(url))
         except Exception as e:
             print(f"    API error at offset {offset}: {e}")
-            break
+            return False
         rows = data.get("rows", [])
         if not rows:
             break
-        records.extend(rows)
+        yield rows
         offset += len(rows)
         if offset % 1000 == 0:
             print(f"    Fetched {offset}...")
         if len(rows) < config["page_size"]:
             break
         time.sleep(RATE_LIMIT)
-    return records
+    return True
 
 
 def fetch_ckan(config):
-    """Fetch all records from CKAN Datastore API.
+    """Yield pages of records from CKAN Datastore API.
 
     Supports two modes:
     - Text search: q="solar" (default, used by San Jose)
     - Filter search: filters={"PERMIT TYPE":"Solar..."} (used by San Antonio)
+
+    Returns False if an API error cut the fetch short, True otherwise.
     """
-    records = []
     offset = 0
     while True:
         params = {
@@ -1385,20 +1853,17 @@ def fetch_ckan(config):
         else:
             params["q"] = "solar"
         url = f"{config['base_url']}?{urllib.parse.urlencode(params)}"
-        req = urllib.request.Request(url, headers={
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-        })
+        headers = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"}
         try:
-            with urllib.request.urlopen(req, timeout=60) as resp:
-                data = json.loads(resp.read().decode())
+            data = json_loads(http_request(url, headers=headers, timeout=60))
         except Exception as e:
             print(f"    API error at offset {offset}: {e}")
-            break
+            return False
         result = data.get("result", {})
         rows = result.get("records", [])
         if not rows:
             break
-        records.extend(rows)
+        yield rows
         offset += len(rows)
         total = result.get("total", 0)
         if offset % 500 == 0 or offset >= total:
@@ -1406,41 +1871,147 @@ def fetch_ckan(config):
         if offset >= total:
             break
         time.sleep(RATE_LIMIT)
-    return records
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Delta ingest watermarks
+# ---------------------------------------------------------------------------
+# Configs with a "date_field" only fetch records issued on/after the
+# watermark saved by the last complete run, instead of the full permit
+# history. The watermark trails the newest date seen by
+# WATERMARK_LOOKBACK_DAYS so permits published late with an earlier issue
+# date are still picked up; the existing-ID dedup drops the overlap.
+
+def load_watermarks():
+    """Load {prefix: YYYY-MM-DD} checkpoints saved by previous runs."""
+    if not WATERMARK_FILE.exists():
+        return {}
+    with open(WATERMARK_FILE) as f:
+        return json.load(f)
+
+
+def save_watermarks(watermarks):
+    WATERMARK_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(WATERMARK_FILE, "w") as f:
+        json.dump(watermarks, f, indent=2, sort_keys=True)
+
+
+def apply_watermark(config, watermark):
+    """Return a copy of config whose filter also requires date_field >= watermark.
+
+    Records with no date_field are kept, since there is no date to compare.
+    The query is also ordered by date_field (then row id) so offset paging
+    is stable while new permits are being published. Only Socrata configs
+    set a date_field; other platforms need their own clause, checked
+    against a real date column, before they can.
+    """
+    if config["platform"] != "socrata":
+        raise ValueError(f"date_field is only supported on Socrata configs, not {config['platform']}")
+    config = dict(config)
+    field = config["date_field"]
+    flt = config.get("filter", "")
+    clause = f"({field} >= '{watermark}' OR {field} IS NULL)"
+    if flt.startswith("$where="):
+        config["filter"] = f"$where=({flt[len('$where='):]}) AND {clause}"
+    else:
+        config["filter"] = f"{flt}&$where={clause}" if flt else f"$where={clause}"
+    config["filter"] += f"&$order={field},:id"
+    return config
+
+
+def newest_issue_date(raw_records, date_field, newest=None):
+    """Latest valid date_field date in raw_records, or newest if none is later."""
+    for r in raw_records:
+        try:
+            d = datetime.date.fromisoformat(safe_date(r.get(date_field)))
+        except (TypeError, ValueError):
+            continue
+        if newest is None or d > newest:
+            newest = d
+    return newest
+
+
+watermark_lock = threading.Lock()  # cities ingested in parallel share one watermark file
+
+
+def advance_watermark(watermarks, config, newest):
+    """Move the prefix's watermark up to WATERMARK_LOOKBACK_DAYS before newest.
+
+    newest is the latest issued date fetched, capped at today so a bad
+    future date in the source can't stall the delta. The watermark never
+    moves backwards, including after a --full run: a full refetch can raise
+    a saved watermark but never lower it.
+    """
+    if newest is None:
+        return
+    newest = min(newest, datetime.date.today()) - datetime.timedelta(days=WATERMARK_LOOKBACK_DAYS)
+    newest = newest.isoformat()
+    with watermark_lock:
+        if newest <= watermarks.get(config["prefix"], ""):
+            return
+        watermarks[config["prefix"]] = newest
+        save_watermarks(watermarks)
+    print(f"  Watermark: {newest}")
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def parse_capacity_from_description(desc):
-    """Extract kW capacity from free-text description."""
+CAPACITY_KW_RE = re.compile(r'(\d+(?:\.\d*)?)\s*kw', re.IGNORECASE)
+PANEL_COUNT_RE = re.compile(r'(\d+)\s*(?:solar\s+)?(?:panel|module|pv\s+module)', re.IGNORECASE)
+PANEL_WATTS_RE = re.compile(r'(\d+)\s*(?:watt|w)\b', re.IGNORECASE)
+
+
+def parse_capacity_from_description(desc, desc_folded=None, include_mw=False):
+    """Extract kW capacity from free-text description.
+
+    With include_mw, a description with no usable kW figure falls back to
+    "5 MW" style utility-scale capacities, converted to kW.
+    """
     if not desc:
         return None
-    # Match "9.6 kW", "250 KW", "9.6kW", "9.600 kw"
-    m = re.search(r'([\d]+\.?\d*)\s*kw', desc, re.IGNORECASE)
-    if m:
-        try:
-            val = float(m.group(1))
-            if 0.1 <= val <= 100000:  # sanity check
-                return val
-        except ValueError:
-            pass
+    # Substring checks are far cheaper than the regexes and rule out most descriptions
+    if desc_folded is None:
+        desc_folded = desc.casefold()
+    if "kw" in desc_folded:
+        # Match "9.6 kW", "250 KW", "9.6kW", "9.600 kw"
+        m = CAPACITY_KW_RE.search(desc)
+        if m:
+            try:
+                val = float(m.group(1))
+                if 0.1 <= val <= 100000:  # sanity check
+                    return val
+            except ValueError:
+                pass
+    if include_mw and "mw" in desc_folded:
+        m = MW_RE.search(desc)
+        if m:
+            try:
+                mw = float(m.group(1))
+                if 0.1 <= mw <= 10000:
+                    return mw * 1000
+            except ValueError:
+                pass
     return None
 
 
-def parse_panels_from_description(desc):
+def parse_panels_from_description(desc, desc_folded=None):
     """Extract panel count and wattage from description."""
     if not desc:
         return None, None
     # "installing 20 solar panels" or "24 modules"
     panels = None
-    m = re.search(r'(\d+)\s*(?:solar\s+)?(?:panel|module|pv\s+module)', desc, re.IGNORECASE)
-    if m:
-        panels = int(m.group(1))
+    if desc_folded is None:
+        desc_folded = desc.casefold()
+    if "panel" in desc_folded or "module" in desc_folded:
+        m = PANEL_COUNT_RE.search(desc)
+        if m:
+            panels = int(m.group(1))
     # "300 watt" or "400W per panel"
     watts = None
-    m = re.search(r'(\d+)\s*(?:watt|w)\b', desc, re.IGNORECASE)
+    m = PANEL_WATTS_RE.search(desc)
     if m:
         watts = int(m.group(1))
         if watts < 50 or watts > 1000:  # not a panel wattage
@@ -1448,6 +2019,38 @@ def parse_panels_from_description(desc):
     return panels, watts
 
 
+description_cache = {}  # description -> parse_description result
+DESCRIPTION_CACHE_MAX = 65536
+
+
+def parse_description(desc):
+    """Extract capacity, panel count, panel wattage and battery flag from description.
+
+    Folds the text once and shares it across every keyword pre-check.
+    """
+    if not desc:
+        return None, None, None, False
+    # Contractor boilerplate repeats verbatim across permits
+    try:
+        return description_cache[desc]
+    except KeyError:
+        pass
+    desc_folded = desc.casefold()
+    capacity_kw = parse_capacity_from_description(desc, desc_folded)
+    panels, watts = parse_panels_from_description(desc, desc_folded)
+    result = capacity_kw, panels, watts, has_battery_keyword(desc, desc_folded)
+    if len(description_cache) >= DESCRIPTION_CACHE_MAX:
+        description_cache.clear()
+    description_cache[desc] = result
+    return result
+
+
+def parse_capacity_and_panels(desc):
+    """Extract capacity, panel count and panel wattage, sharing parse_description's cache."""
+    capacity_kw, panels, watts, _ = parse_description(desc)
+    return capacity_kw, panels, watts
+
+
 def safe_float(val):
     if val is None or val == "":
         return None
@@ -1457,40 +2060,199 @@ def safe_float(val):
         return None
 
 
+# x, y doubles of a little-endian WKB point (read at offset 9, after the
+# byte-order flag, geometry type and SRID)
+WKB_POINT_XY = struct.Struct('<dd')
+
+# Half the EPSG:3857 world width in meters
+MERCATOR_HALF_EXTENT = 20037508.34
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+MS_PER_DAY = 86400000
+
+ISO_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})(?:T|$)')
+
+date_cache = {}  # raw date string -> safe_date result
+DATE_CACHE_MAX = 100000
+
+
 def safe_date(val):
     """Extract YYYY-MM-DD from various date formats including Unix ms timestamps."""
     if not val:
         return None
-    # Handle Unix millisecond timestamps (ArcGIS returns these)
+    # Handle Unix millisecond timestamps (ArcGIS returns these).
+    # Whole-day arithmetic on the ordinal avoids a datetime + strftime round-trip.
     if isinstance(val, (int, float)) and val > 946684800000:  # After year 2000 in ms
         try:
-            import datetime
-            dt = datetime.datetime.utcfromtimestamp(val / 1000)
-            return dt.strftime("%Y-%m-%d")
-        except (ValueError, OSError):
+            return datetime.date.fromordinal(EPOCH_ORDINAL + int(val // MS_PER_DAY)).isoformat()
+        except (ValueError, OverflowError):
             pass
-    s = str(val).strip()
+    if not isinstance(val, str):
+        return parse_date_string(str(val))
+    # Feeds repeat the same date strings across many records
+    try:
+        return date_cache[val]
+    except KeyError:
+        pass
+    if len(date_cache) >= DATE_CACHE_MAX:
+        date_cache.clear()
+    result = date_cache[val] = parse_date_string(val)
+    return result
+
+
+def parse_date_string(s):
+    """YYYY-MM-DD from an ISO date/datetime or Unix ms string, else None."""
+    s = s.strip()
     # Check for pure numeric (Unix ms as string)
     if s.isdigit() and len(s) >= 12:
         try:
-            import datetime
-            dt = datetime.datetime.utcfromtimestamp(int(s) / 1000)
-            return dt.strftime("%Y-%m-%d")
-        except (ValueError, OSError):
+            return datetime.date.fromordinal(EPOCH_ORDINAL + int(s) // MS_PER_DAY).isoformat()
+        except (ValueError, OverflowError):
             pass
-    if "T" in s:
-        s = s.split("T")[0]
-    # Validate it looks like a date
-    if re.match(r'^\d{4}-\d{2}-\d{2}$', s):
-        return s
-    return None
+    # Date, or the date part of an ISO datetime ("2023-06-14T00:00:00.000")
+    m = ISO_DATE_RE.match(s)
+    return m.group(1) if m else None
+
+
+def valid_lat_lng(lat, lng):
+    """True if lat/lng are within WGS84 range (NaN and infinities fail the comparisons)."""
+    return -90 <= lat <= 90 and -180 <= lng <= 180
+
+
+def mercator_lng(x):
+    """Web Mercator (EPSG:3857) x in meters to WGS84 longitude."""
+    return x / MERCATOR_HALF_EXTENT * 180.0
+
+
+def mercator_lat(y):
+    """Web Mercator (EPSG:3857) y in meters to WGS84 latitude."""
+    return (math.atan(math.exp(y / MERCATOR_HALF_EXTENT * math.pi)) * 360.0 / math.pi) - 90.0
+
+
+false_positive_cache = {}  # description -> is_solar_false_positive result
+FALSE_POSITIVE_CACHE_MAX = 65536
 
 
 def is_solar_false_positive(desc):
     """Check if a description is a solar screen/shade/tube, not PV."""
     if not desc:
         return False
-    return bool(SOLAR_FALSE_POSITIVES.search(desc))
+    # Boilerplate descriptions repeat across many permits
+    try:
+        return false_positive_cache[desc]
+    except KeyError:
+        pass
+    # Every false-positive pattern starts with "solar"
+    result = "solar" in desc.casefold() and bool(SOLAR_FALSE_POSITIVES.search(desc))
+    if len(false_positive_cache) >= FALSE_POSITIVE_CACHE_MAX:
+        false_positive_cache.clear()
+    false_positive_cache[desc] = result
+    return result
+
+
+def has_battery_keyword(text, text_lower=None):
+    """Same answer as BATTERY_RE.search(text).
+
+    For ASCII text (str.isascii() is O(1)) the case-insensitive match is exactly a
+    substring check on the lowercased text; anything else goes through the regex.
+    """
+    if text.isascii():
+        if text_lower is None:
+            text_lower = text.lower()
+        return any(k in text_lower for k in BATTERY_KEYWORDS)
+    return bool(BATTERY_RE.search(text))
+
+
+def has_solar_keyword(text, pattern=SOLAR_KEYWORD_RE):
+    """Same answer as pattern.search(text) for the solar keyword gate patterns.
+
+    Each gate is "solar", "photovoltaic" or a "pv..." phrase, so for ASCII text
+    only descriptions mentioning "pv" without the plain words need the regex.
+    """
+    if text.isascii():
+        text_lower = text.lower()
+        if "solar" in text_lower or "photovoltaic" in text_lower:
+            return True
+        if "pv" not in text_lower:
+            return False
+    return bool(pattern.search(text))
+
+
+def keyword_search(pattern, text, text_lower, keywords):
+    """pattern.search(text), skipped when ASCII text has none of the keywords.
+
+    keywords are lowercase literals at least one of which every match contains; for
+    ASCII text the case-insensitive pattern can only match if text_lower has one.
+    """
+    if text.isascii() and not any(k in text_lower for k in keywords):
+        return None
+    return pattern.search(text)
+
+
+config_city_cache = {}  # config name -> city part
+
+
+def config_city(config):
+    """City part of a config's display name ("Cary, NC" -> "Cary"), computed once per feed."""
+    name = config["name"]
+    try:
+        return config_city_cache[name]
+    except KeyError:
+        city = config_city_cache[name] = name.split(",")[0].strip()
+        return city
+
+
+def zip_from_address(raw_addr):
+    """First 5-digit run in the last comma-separated part of raw_addr that has one."""
+    head, _, tail = raw_addr.rpartition(",")
+    m = ZIP5_RE.search(tail)
+    while not m and head:
+        head, _, tail = head.rpartition(",")
+        m = ZIP5_RE.search(tail)
+    return m.group() if m else None
+
+
+def find_manufacturer(desc_lower, manufacturers):
+    """Return the first (name, lowercased) manufacturer whose name appears in desc_lower."""
+    for name, key in manufacturers:
+        if key in desc_lower:
+            return name
+    return None
+
+
+def find_model_after(desc, desc_lower, name):
+    """Model token following the first "<name>[ :]" in desc, like MANUFACTURER_MODEL_RES[name]."""
+    if not desc.isascii():
+        m = MANUFACTURER_MODEL_RES[name].search(desc)
+        return m.group(1) if m else None
+    key = name.lower()
+    idx = desc_lower.find(key)
+    while idx >= 0:
+        m = MODEL_AFTER_RE.match(desc, idx + len(key))
+        if m:
+            return m.group(1)
+        idx = desc_lower.find(key, idx + 1)
+    return None
+
+
+def equipment_from_match(m, equipment_type, group=1):
+    """Equipment dict from a "<manufacturer> <model>" match, manufacturer in the given group."""
+    return {
+        "equipment_type": equipment_type,
+        "manufacturer": sys.intern(m.group(group).strip()),
+        "model": m.group(group + 1).strip(),
+    }
+
+
+def mount_type_from_keywords(desc_upper):
+    """Mount type from an uppercased description: ground, then roof, then carport/canopy."""
+    if "GROUND" in desc_upper:  # also covers "GROUND-MOUNT"
+        return "ground"
+    if "ROOF" in desc_upper:  # also covers "ROOFTOP"
+        return "rooftop"
+    if "CARPORT" in desc_upper or "CANOPY" in desc_upper:
+        return "carport"
+    return None
 
 
 def make_installation(source_id, config, **fields):
@@ -1539,8 +2301,7 @@ def transform_cambridge_rich(record, data_source_id, config):
         # watt_capacity is in watts, convert to kW
         kw = kw / 1000
 
-    building_use = str(record.get("building_use", "")).lower()
-    site_type = "commercial" if "commercial" in building_use or "industrial" in building_use else "commercial"
+    site_type = "commercial"
 
     mount = str(record.get("mount_type", "")).lower()
     mount_type = None
@@ -1662,8 +2423,7 @@ def transform_honolulu(record, data_source_id, config):
     source_id = f"permit_honolulu_{permit_id}"
 
     addr = record.get("address", "") or record.get("jobaddress", "")
-    comm_res = str(record.get("commercialresidential", "")).lower()
-    site_type = "commercial" if "commercial" in comm_res else "commercial"
+    site_type = "commercial"
 
     # Contractor — prefer electrical contractor (cleaner), fall back to general
     installer = record.get("contractorelectrical", "")
@@ -1743,8 +2503,7 @@ def transform_sf(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts = parse_capacity_and_panels(desc)
 
     lat, lng = None, None
     loc = record.get("location")
@@ -1814,12 +2573,11 @@ def transform_chicago(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts = parse_capacity_and_panels(desc)
 
     # Extract inverter kW from description
     inv_kw = None
-    m = re.search(r'inverter\s+output\s+([\d.]+)\s*kw', desc, re.IGNORECASE)
+    m = INVERTER_OUTPUT_KW_RE.search(desc)
     if m:
         inv_kw = safe_float(m.group(1))
 
@@ -1829,13 +2587,13 @@ def transform_chicago(record, data_source_id, config):
         lat = safe_float(loc.get("latitude"))
         lng = safe_float(loc.get("longitude"))
 
-    addr_parts = [
+    addr_parts = (
         record.get("street_number", ""),
         record.get("street_direction", ""),
         record.get("street_name", ""),
         record.get("suffix", ""),
-    ]
-    addr = " ".join(p for p in addr_parts if p).strip() or None
+    )
+    addr = " ".join(filter(None, addr_parts)).strip() or None
 
     inst = make_installation(
         source_id, config,
@@ -1938,7 +2696,7 @@ def transform_blds(record, data_source_id, config):
     addr = record.get("originaladdress1", "") or record.get("address", "") or record.get("original_address1", "")
     city_name = record.get("originalcity", "") or record.get("original_city", "")
     if not city_name:
-        city_name = config["name"].split(",")[0].strip()
+        city_name = config_city(config)
 
     inst = make_installation(
         source_id, config,
@@ -1960,10 +2718,7 @@ def transform_generic_socrata(record, data_source_id, config):
     """Generic Socrata building permit transform — tries common field names."""
     # Try many common permit ID field names
     permit_num = None
-    for field in ["permit_number", "permit_num", "permitnum", "permitnumber", "permitno", "permit_no",
-                   "permit_", "permit", "id", "permit_id", "application_number", "applicationnumber",
-                   "record_number", "case_number", "file_number", "permit_case_id",
-                   "permit_tracking_id", "objectid"]:
+    for field in GENERIC_PERMIT_FIELDS:
         val = record.get(field)
         if val and str(val).strip():
             permit_num = str(val).strip()
@@ -1977,9 +2732,7 @@ def transform_generic_socrata(record, data_source_id, config):
 
     # Description from multiple possible fields
     desc = ""
-    for field in ["description", "work_description", "work_desc", "permit_description",
-                   "permitdescription", "scope_of_work", "project_description", "projectdesc",
-                   "workdescription", "work", "case_name"]:
+    for field in GENERIC_DESC_FIELDS:
         val = record.get(field)
         if val and str(val).strip():
             desc = str(val).strip()
@@ -1992,9 +2745,7 @@ def transform_generic_socrata(record, data_source_id, config):
 
     # Address from multiple possible fields
     addr = None
-    for field in ["address", "street_address", "site_address", "location_address",
-                   "original_address1", "originaladdress1", "primary_address", "project_address",
-                   "property_address", "propertyaddress", "full_address", "siteaddress"]:
+    for field in GENERIC_ADDRESS_FIELDS:
         val = record.get(field)
         if val and str(val).strip():
             addr = str(val).strip()
@@ -2009,19 +2760,17 @@ def transform_generic_socrata(record, data_source_id, config):
 
     # City
     city = None
-    for field in ["city", "original_city", "originalcity", "site_city", "mailing_city",
-                   "parceladdresscity", "propertycity", "city_town"]:
+    for field in GENERIC_CITY_FIELDS:
         val = record.get(field)
         if val and str(val).strip():
             city = str(val).strip()
             break
     if not city:
-        city = config["name"].split(",")[0].strip()
+        city = config_city(config)
 
     # Zip
     zip_code = None
-    for field in ["zip_code", "zipcode", "zip", "original_zip", "originalzip", "site_zip",
-                   "postal_code", "parceladdresszip", "propertyzip"]:
+    for field in GENERIC_ZIP_FIELDS:
         val = record.get(field)
         if val and str(val).strip():
             zip_code = str(val).strip()
@@ -2049,14 +2798,12 @@ def transform_generic_socrata(record, data_source_id, config):
                     break
 
     # Validate coordinate range (State Plane / projected coords would be way out of range)
-    if lat and (lat < -90 or lat > 90 or lng < -180 or lng > 180):
+    if lat and not valid_lat_lng(lat, lng):
         lat, lng = None, None
 
     # Date
     install_date = None
-    for field in ["issue_date", "issued_date", "issueddate", "permit_issued_date", "date_issued",
-                   "issuedate", "issuance_date", "permit_issuance_date", "issueddate",
-                   "permitissuedate", "applied_date", "applied", "issuedate"]:
+    for field in GENERIC_DATE_FIELDS:
         val = record.get(field)
         if val:
             install_date = safe_date(val)
@@ -2065,9 +2812,7 @@ def transform_generic_socrata(record, data_source_id, config):
 
     # Installer
     installer = None
-    for field in ["contractor_name", "contractor", "contractor_company_desc", "contact_1_name",
-                   "applicant_name", "firm_name", "company_name", "companyname",
-                   "professionalname"]:
+    for field in GENERIC_INSTALLER_FIELDS:
         val = record.get(field)
         if val and str(val).strip():
             installer = str(val).strip()
@@ -2075,10 +2820,7 @@ def transform_generic_socrata(record, data_source_id, config):
 
     # Cost
     cost = None
-    for field in ["project_valuation", "estimated_cost", "valuation", "valuationtotal",
-                   "value", "total_cost", "reported_cost", "job_value", "jobvalue",
-                   "estimated_job_cost", "estprojectcostdec", "construction_value",
-                   "buildingvaluation", "declvltn", "amount", "fee"]:
+    for field in GENERIC_COST_FIELDS:
         val = record.get(field)
         if val:
             cost = safe_float(val)
@@ -2087,8 +2829,7 @@ def transform_generic_socrata(record, data_source_id, config):
 
     # Owner
     owner = None
-    for field in ["owner_name", "property_owner_name", "owner", "ownername", "property_owner",
-                   "owner_company_name"]:
+    for field in GENERIC_OWNER_FIELDS:
         val = record.get(field)
         if val and str(val).strip():
             owner = str(val).strip()
@@ -2130,20 +2871,20 @@ def transform_salt_lake_city(record, data_source_id, config):
     street_dir = record.get("projectstreetdir", "")
     street_name = record.get("projectstreetname", "")
     suffix = record.get("projectstreetsufx", "")
-    addr = " ".join(p for p in [house, street_dir, street_name, suffix] if p).strip() or None
+    addr = " ".join(filter(None, (house, street_dir, street_name, suffix))).strip() or None
 
     # Parse lat/lng from location field: "516 E 12TH Ave\nSalt Lake City, UT 84103\n(40.783, -111.874)"
     lat, lng = None, None
     loc = record.get("location", "")
     if isinstance(loc, str):
-        m = re.search(r'\(([-\d.]+),\s*([-\d.]+)\)', loc)
+        m = LOCATION_COORDS_RE.search(loc)
         if m:
             lat = safe_float(m.group(1))
             lng = safe_float(m.group(2))
 
     zip_code = record.get("zipcode", "")
-    if zip_code and "-" in zip_code:
-        zip_code = zip_code.split("-")[0]  # Strip +4
+    if zip_code:
+        zip_code = zip_code.partition("-")[0]  # Strip +4
 
     installer = record.get("applicantbusinessname", "")
 
@@ -2175,11 +2916,7 @@ def transform_sacramento(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
-
-    # Check for battery storage in description
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
+    capacity_kw, panels, watts, has_battery = parse_description(desc)
 
     inst = make_installation(
         source_id, config,
@@ -2218,26 +2955,15 @@ def transform_philadelphia(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts = parse_capacity_and_panels(desc)
 
     # Parse manufacturer from description (e.g., "JA SOLAR panels", "SolarEdge inverter")
-    equip_manufacturer = None
-    equip_model = None
-    for mfr in ["JA Solar", "Canadian Solar", "Hanwha", "Qcells", "Q CELLS", "REC", "LG",
-                 "SunPower", "Trina", "LONGi", "Jinko", "Silfab", "Mission Solar", "Panasonic",
-                 "Solaria", "Axitec", "Aptos", "Meyer Burger", "Maxeon"]:
-        if mfr.lower() in desc.lower():
-            equip_manufacturer = mfr
-            break
-
-    inv_manufacturer = None
-    for mfr in ["SolarEdge", "Enphase", "SMA", "Fronius", "ABB", "Generac", "Tesla"]:
-        if mfr.lower() in desc.lower():
-            inv_manufacturer = mfr
-            break
+    # One lowercased copy serves the manufacturer and battery keyword checks
+    desc_lower = desc.lower()
+    equip_manufacturer = find_manufacturer(desc_lower, PHILLY_PANEL_MANUFACTURERS)
+    inv_manufacturer = find_manufacturer(desc_lower, INVERTER_MANUFACTURERS)
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
+    has_battery = has_battery_keyword(desc, desc_lower)
 
     # Owner from Carto field
     owner = record.get("opa_owner", "")
@@ -2247,25 +2973,17 @@ def transform_philadelphia(record, data_source_id, config):
     the_geom = record.get("the_geom")
     if the_geom and len(the_geom) >= 50:
         try:
-            import struct, binascii, math
-            wkb = binascii.unhexlify(the_geom)
-            _lng = struct.unpack_from('<d', wkb, 9)[0]
-            _lat = struct.unpack_from('<d', wkb, 17)[0]
-            if (not math.isnan(_lat) and not math.isnan(_lng) and
-                not math.isinf(_lat) and not math.isinf(_lng) and
-                -90 <= _lat <= 90 and -180 <= _lng <= 180):
+            _lng, _lat = WKB_POINT_XY.unpack_from(bytes.fromhex(the_geom), 9)
+            if valid_lat_lng(_lat, _lng):
                 lat, lng = _lat, _lng
         except Exception:
             pass
 
-    # Commercial check
-    comm_res = str(record.get("commercialorresidential", "")).lower()
-    site_type = "commercial" if "commercial" in comm_res else "commercial"
+    site_type = "commercial"
 
     # Truncate zip to 5 digits
-    zip_code = str(record.get("zip", "")) if record.get("zip") else None
-    if zip_code and len(zip_code) > 5:
-        zip_code = zip_code[:5]
+    zip_raw = record.get("zip")
+    zip_code = str(zip_raw)[:5] if zip_raw else None
 
     inst = make_installation(
         source_id, config,
@@ -2313,8 +3031,7 @@ def transform_san_jose(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts, has_battery = parse_description(desc)
 
     # Coordinates from gx_location
     lat, lng = None, None
@@ -2323,8 +3040,6 @@ def transform_san_jose(record, data_source_id, config):
         lat = safe_float(loc.get("latitude"))
         lng = safe_float(loc.get("longitude"))
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
-
     inst = make_installation(
         source_id, config,
         address=record.get("ADDRESS", "") or record.get("address", ""),
@@ -2378,19 +3093,15 @@ def transform_denver(record, data_source_id, config):
     # Determine county from city
     county = None
     if city:
-        city_upper = city.upper()
-        if "BOULDER" in city_upper:
-            county = "BOULDER"
-        elif "DENVER" in city_upper:
-            county = "DENVER"
-        elif "AURORA" in city_upper:
-            county = "ARAPAHOE"
-        elif "LAKEWOOD" in city_upper or "GOLDEN" in city_upper:
-            county = "JEFFERSON"
-        elif "BROOMFIELD" in city_upper:
-            county = "BROOMFIELD"
-        elif "LONGMONT" in city_upper or "ERIE" in city_upper or "LOUISVILLE" in city_upper:
-            county = "BOULDER"
+        if city in denver_county_cache:
+            county = denver_county_cache[city]
+        else:
+            city_upper = city.upper()
+            for name, name_county in DENVER_CITY_COUNTIES:
+                if name in city_upper:
+                    county = name_county
+                    break
+            denver_county_cache[city] = county
 
     pv_cost = safe_float(record.get("EstPhotovoltaicCost"))
     project_cost = safe_float(record.get("EstProjectCost"))
@@ -2430,8 +3141,7 @@ def transform_minneapolis(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts = parse_capacity_and_panels(desc)
 
     lat = safe_float(record.get("Latitude") or record.get("_lat"))
     lng = safe_float(record.get("Longitude") or record.get("_lng"))
@@ -2479,8 +3189,7 @@ def transform_detroit(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts = parse_capacity_and_panels(desc)
 
     lat = safe_float(record.get("latitude") or record.get("_lat"))
     lng = safe_float(record.get("longitude") or record.get("_lng"))
@@ -2488,11 +3197,8 @@ def transform_detroit(record, data_source_id, config):
     # Cost is a string field in Detroit's API
     cost = safe_float(record.get("amt_estimated_contractor_cost"))
 
-    # Determine site type from current_use_type
-    use_type = str(record.get("current_use_type", "")).lower()
+    # Residential use types are kept as commercial per project spec (>= 25kW filter)
     site_type = "commercial"
-    if "single family" in use_type or "two family" in use_type or "residential" in use_type:
-        site_type = "commercial"  # We keep as commercial per project spec (>= 25kW filter)
 
     inst = make_installation(
         source_id, config,
@@ -2530,23 +3236,23 @@ def transform_albuquerque(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts, has_battery = parse_description(desc)
 
     # ArcGIS geometry is Web Mercator — need to convert to WGS84
     lat, lng = None, None
     raw_lat = record.get("_lat")
     raw_lng = record.get("_lng")
     if raw_lat and raw_lng:
-        # Web Mercator (EPSG:3857) to WGS84 conversion
-        import math
+        # Validate longitude before paying for the exp/atan latitude conversion
         x = float(raw_lng)
         y = float(raw_lat)
-        lng = x / 20037508.34 * 180.0
-        lat = (math.atan(math.exp(y / 20037508.34 * math.pi)) * 360.0 / math.pi) - 90.0
-        # Validate
-        if lat < 30 or lat > 40 or lng < -110 or lng > -103:
-            lat, lng = None, None
+        lng = mercator_lng(x)
+        if -110 <= lng <= -103:
+            lat = mercator_lat(y)
+            if lat < 30 or lat > 40:
+                lat, lng = None, None
+        else:
+            lng = None
 
     addr = record.get("CalculatedAddress", "") or record.get("FreeFormAddress", "")
     owner = record.get("Owner", "")
@@ -2556,11 +3262,7 @@ def transform_albuquerque(record, data_source_id, config):
     # Use contractor as installer, applicant as developer if different
     installer = contractor if contractor else applicant
 
-    # Determine site type
-    category = str(record.get("GeneralCategory", "")).lower()
-    site_type = "commercial" if "commercial" in category else "commercial"
-
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
+    site_type = "commercial"
 
     inst = make_installation(
         source_id, config,
@@ -2601,8 +3303,9 @@ def transform_riverside_county(record, data_source_id, config):
         return None, None, None
 
     # Parse capacity from description: "5.33KW DC" or "206.93 MW DC"
+    desc_lower = desc.lower()
     capacity_kw = None
-    m = re.search(r'([\d]+\.?\d*)\s*MW\s*(?:DC|AC)?', desc, re.IGNORECASE)
+    m = keyword_search(MW_RE, desc, desc_lower, ("mw",))
     if m:
         mw = float(m.group(1))
         if 0.025 <= mw <= 5000:
@@ -2613,21 +3316,10 @@ def transform_riverside_county(record, data_source_id, config):
     panels, watts = parse_panels_from_description(desc)
 
     # Extract manufacturer from description
-    equip_manufacturer = None
-    for mfr in ["Qcells", "Q CELLS", "Canadian Solar", "JA Solar", "Hanwha", "REC", "LG",
-                 "SunPower", "Trina", "LONGi", "Jinko", "Silfab", "Mission Solar", "Panasonic",
-                 "Solaria", "Axitec", "Aptos", "Maxeon"]:
-        if mfr.lower() in desc.lower():
-            equip_manufacturer = mfr
-            break
+    equip_manufacturer = find_manufacturer(desc_lower, RIVERSIDE_PANEL_MANUFACTURERS)
+    inv_manufacturer = find_manufacturer(desc_lower, INVERTER_MANUFACTURERS)
 
-    inv_manufacturer = None
-    for mfr in ["SolarEdge", "Enphase", "SMA", "Fronius", "ABB", "Generac", "Tesla"]:
-        if mfr.lower() in desc.lower():
-            inv_manufacturer = mfr
-            break
-
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
+    has_battery = has_battery_keyword(desc, desc_lower)
 
     # Mount type from CASE_WORK_CLASS
     work_class = str(record.get("CASE_WORK_CLASS", "")).upper()
@@ -2699,8 +3391,7 @@ def transform_dc(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts, has_battery = parse_description(desc)
 
     lat = safe_float(record.get("LATITUDE") or record.get("_lat"))
     lng = safe_float(record.get("LONGITUDE") or record.get("_lng"))
@@ -2710,8 +3401,6 @@ def transform_dc(record, data_source_id, config):
 
     addr = record.get("FULL_ADDRESS", "") or record.get("ADDRESS", "")
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
-
     inst = make_installation(
         source_id, config,
         address=addr,
@@ -2749,14 +3438,11 @@ def transform_miami_dade(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts, has_battery = parse_description(desc)
 
     lat = safe_float(record.get("_lat"))
     lng = safe_float(record.get("_lng"))
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
-
     inst = make_installation(
         source_id, config,
         address=record.get("ADDRESS", ""),
@@ -2794,10 +3480,7 @@ def transform_kansas_city(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
-
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
+    capacity_kw, panels, watts, has_battery = parse_description(desc)
 
     inst = make_installation(
         source_id, config,
@@ -2834,14 +3517,11 @@ def transform_orlando(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts, has_battery = parse_description(desc)
 
     lat = safe_float(record.get("latitude"))
     lng = safe_float(record.get("longitude"))
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
-
     inst = make_installation(
         source_id, config,
         address=record.get("permit_address", ""),
@@ -2880,28 +3560,17 @@ def transform_baton_rouge(record, data_source_id, config):
         return None, None, None
 
     # Filter out billboard/sign permits
-    if re.search(r'\bbillboard\b|\bsign\b|\badvertis', desc, re.IGNORECASE):
+    desc_lower = desc.lower()
+    if keyword_search(SIGN_PERMIT_RE, desc, desc_lower, ("billboard", "sign", "advertis")):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts = parse_capacity_and_panels(desc)
 
     # Extract manufacturer from description
-    equip_manufacturer = None
-    for mfr in ["Qcells", "Q CELLS", "Canadian Solar", "JA Solar", "Hanwha", "REC", "LG",
-                 "SunPower", "Trina", "LONGi", "Jinko", "Silfab", "Mission Solar", "Panasonic",
-                 "Solaria", "Axitec", "Aptos", "Maxeon", "Tesla"]:
-        if mfr.lower() in desc.lower():
-            equip_manufacturer = mfr
-            break
+    equip_manufacturer = find_manufacturer(desc_lower, PANEL_MANUFACTURERS)
+    inv_manufacturer = find_manufacturer(desc_lower, INVERTER_MANUFACTURERS)
 
-    inv_manufacturer = None
-    for mfr in ["SolarEdge", "Enphase", "SMA", "Fronius", "ABB", "Generac", "Tesla"]:
-        if mfr.lower() in desc.lower():
-            inv_manufacturer = mfr
-            break
-
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
+    has_battery = has_battery_keyword(desc, desc_lower)
 
     inst = make_installation(
         source_id, config,
@@ -2943,8 +3612,7 @@ def transform_durham(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts = parse_capacity_and_panels(desc)
 
     lat = safe_float(record.get("_lat"))
     lng = safe_float(record.get("_lng"))
@@ -2984,8 +3652,7 @@ def transform_raleigh(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts, has_battery = parse_description(desc)
 
     # Raleigh has lat/lng directly in attributes AND in geometry
     lat = safe_float(record.get("latitude_perm") or record.get("_lat"))
@@ -2999,8 +3666,6 @@ def transform_raleigh(record, data_source_id, config):
     owner = record.get("parcelownername", "") or ""
     cost = safe_float(record.get("estprojectcost"))
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
-
     inst = make_installation(
         source_id, config,
         address=addr,
@@ -3039,8 +3704,7 @@ def transform_fort_lauderdale(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts, has_battery = parse_description(desc)
 
     lat = safe_float(record.get("_lat"))
     lng = safe_float(record.get("_lng"))
@@ -3050,8 +3714,6 @@ def transform_fort_lauderdale(record, data_source_id, config):
     addr = record.get("FULLADDR", "") or record.get("FullAddr", "")
     cost = safe_float(record.get("ESTCOST") or record.get("EstCost"))
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
-
     inst = make_installation(
         source_id, config,
         address=addr,
@@ -3089,8 +3751,7 @@ def transform_phoenix(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts, has_battery = parse_description(desc)
 
     lat = safe_float(record.get("_lat"))
     lng = safe_float(record.get("_lng"))
@@ -3098,8 +3759,6 @@ def transform_phoenix(record, data_source_id, config):
     installer = record.get("PROFESS_NAME", "") or ""
     addr = record.get("STREET_FULL_NAME", "") or ""
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
-
     inst = make_installation(
         source_id, config,
         address=addr,
@@ -3135,17 +3794,8 @@ def transform_maricopa_county(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
     # Also check for MW in description (utility-scale projects)
-    if not capacity_kw:
-        m = re.search(r'([\d]+\.?\d*)\s*mw', desc, re.IGNORECASE)
-        if m:
-            try:
-                mw = float(m.group(1))
-                if 0.1 <= mw <= 10000:
-                    capacity_kw = mw * 1000
-            except ValueError:
-                pass
+    capacity_kw = parse_capacity_from_description(desc, include_mw=True)
 
     panels, watts = parse_panels_from_description(desc)
 
@@ -3161,7 +3811,7 @@ def transform_maricopa_county(record, data_source_id, config):
     if "Residential" in permit_type:
         site_type = "commercial"  # keep as commercial per our filter (>=25kW)
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
+    has_battery = has_battery_keyword(desc)
 
     inst = make_installation(
         source_id, config,
@@ -3200,19 +3850,9 @@ def transform_sacramento_county(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
-
     # Check for MW in description (utility-scale)
-    if not capacity_kw:
-        m = re.search(r'([\d]+\.?\d*)\s*mw', desc, re.IGNORECASE)
-        if m:
-            try:
-                mw = float(m.group(1))
-                if 0.1 <= mw <= 10000:
-                    capacity_kw = mw * 1000
-            except ValueError:
-                pass
+    capacity_kw = parse_capacity_from_description(desc, include_mw=True)
+    panels, watts = parse_panels_from_description(desc)
 
     lat = safe_float(record.get("_lat"))
     lng = safe_float(record.get("_lng"))
@@ -3221,40 +3861,26 @@ def transform_sacramento_county(record, data_source_id, config):
     # e.g., "2828 WALNUT AVE, CARMICHAEL, CA 956084217"
     raw_addr = record.get("Address", "") or ""
     addr, city, zipcode = raw_addr, None, None
-    if raw_addr:
-        parts = [p.strip() for p in raw_addr.split(",")]
-        if len(parts) >= 2:
-            addr = parts[0]
-            city = parts[1] if len(parts) >= 2 else None
-            # Extract zip from last part
-            for part in reversed(parts):
-                m = re.search(r'(\d{5})', part)
-                if m:
-                    zipcode = m.group(1)
-                    break
+    if "," in raw_addr:
+        street, _, rest = raw_addr.partition(",")
+        addr = street.strip()
+        city = rest.partition(",")[0].strip()
+        # Extract zip from the last part that has one — nearly always "CA 956084217"
+        zipcode = zip_from_address(raw_addr)
 
     # Extract manufacturer from description
-    equip_manufacturer = None
-    for mfr in ["Qcells", "Q CELLS", "Canadian Solar", "JA Solar", "Hanwha", "REC", "LG",
-                 "SunPower", "Trina", "LONGi", "Jinko", "Silfab", "Mission Solar", "Panasonic",
-                 "Solaria", "Axitec", "Aptos", "Maxeon", "Tesla"]:
-        if mfr.lower() in desc.lower():
-            equip_manufacturer = mfr
-            break
+    desc_lower = desc.lower()
+    equip_manufacturer = find_manufacturer(desc_lower, PANEL_MANUFACTURERS)
 
-    inv_manufacturer = None
+    inv_manufacturer = find_manufacturer(desc_lower, SACRAMENTO_COUNTY_INVERTER_MANUFACTURERS)
     inv_model = None
-    for mfr in ["SolarEdge", "Enphase", "SMA", "Fronius", "ABB", "Generac", "Tesla", "Delta"]:
-        if mfr.lower() in desc.lower():
-            inv_manufacturer = mfr
-            # Try to extract model (e.g., "Delta M6-TL-US", "SolarEdge SE7600H")
-            pattern = re.compile(re.escape(mfr) + r'\s+(\S+)', re.IGNORECASE)
-            mm = pattern.search(desc)
-            if mm:
-                inv_model = mm.group(1)
-            break
+    if inv_manufacturer:
+        # Try to extract model (e.g., "Delta M6-TL-US", "SolarEdge SE7600H")
+        mm = SACRAMENTO_COUNTY_INVERTER_MODEL_RES[inv_manufacturer].search(desc)
+        if mm:
+            inv_model = mm.group(1)
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
+    has_battery = has_battery_keyword(desc, desc_lower)
 
     # Determine site type from Application_Subtype
     subtype = str(record.get("Application_Subtype", "")).lower()
@@ -3324,14 +3950,18 @@ def transform_tucson(record, data_source_id, config):
     lat = safe_float(record.get("LAT") or record.get("_lat"))
     lng = safe_float(record.get("LON") or record.get("_lng"))
 
-    # Parse structured equipment from description
+    # Parse structured equipment from description. Every labelled field needs a
+    # colon, so free-text descriptions skip straight to the generic parsers.
+    desc_lower = desc.lower()
+    structured = ":" in desc
+
     # System size: "SYSTEM SIZE: 8140W DC" or "8.14 kW" or "11.9KW DC"
     capacity_kw = None
-    m = re.search(r'SYSTEM\s+SIZE:\s*([\d.]+)\s*W\s*DC', desc, re.IGNORECASE)
+    m = TUCSON_SYSTEM_SIZE_RE.search(desc) if structured else None
     if m:
         capacity_kw = float(m.group(1)) / 1000  # Convert watts to kW
-    if not capacity_kw:
-        m = re.search(r'([\d.]+)\s*KW\s*DC', desc, re.IGNORECASE)
+    if not capacity_kw and "dc" in desc_lower:
+        m = KW_DC_RE.search(desc)
         if m:
             capacity_kw = float(m.group(1))
     if not capacity_kw:
@@ -3342,10 +3972,11 @@ def transform_tucson(record, data_source_id, config):
     module_manufacturer = None
     module_model = None
     module_count = None
-    m = re.search(r'MODULES?:\s*\((\d+)\)\s*([^:\n]+?):\s*(\S+)', desc, re.IGNORECASE)
+    m = TUCSON_MODULES_RE.search(desc) if structured else None
     if m:
         module_count = int(m.group(1))
-        module_manufacturer = m.group(2).strip()
+        # Brands repeat across thousands of permits; keep one string per name
+        module_manufacturer = sys.intern(m.group(2).strip())
         module_model = m.group(3).strip()
     else:
         # Simpler pattern: just count from description
@@ -3356,37 +3987,35 @@ def transform_tucson(record, data_source_id, config):
     inv_manufacturer = None
     inv_model = None
     inv_count = None
-    m = re.search(r'INVERTERS?:\s*\((\d+)\)\s*([^:\n]+?):\s*(\S+)', desc, re.IGNORECASE)
+    m = TUCSON_INVERTERS_RE.search(desc) if structured else None
     if m:
         inv_count = int(m.group(1))
-        inv_manufacturer = m.group(2).strip()
+        inv_manufacturer = sys.intern(m.group(2).strip())
         inv_model = m.group(3).strip()
 
     # Parse racking type: "RACKING: ADJUSTABLE TILE HOOK" or "RACKING: IRONRIDGE"
     racking_type = None
-    m = re.search(r'RACKING:\s*([^\n•]+)', desc, re.IGNORECASE)
+    m = TUCSON_RACKING_RE.search(desc) if structured else None
     if m:
         racking_type = m.group(1).strip()
         # Clean up trailing reference numbers
-        racking_type = re.sub(r',?\s*SEE\s+DRAWING.*', '', racking_type, flags=re.IGNORECASE).strip()
+        racking_type = TUCSON_SEE_DRAWING_RE.sub('', racking_type).strip()
         if len(racking_type) > 100:
             racking_type = racking_type[:100]
 
     # Mount type from WORKCLASS or description
     workclass = str(record.get("WORKCLASS", "")).lower()
     mount_type = None
-    if "ground" in desc.lower() or "ground" in workclass:
+    if "ground" in desc_lower or "ground" in workclass:
         mount_type = "ground_fixed"
-    elif "roof" in desc.lower() or "roof" in workclass:
+    elif "roof" in desc_lower or "roof" in workclass:
         mount_type = "rooftop"
-    elif "carport" in desc.lower():
+    elif "carport" in desc_lower:
         mount_type = "carport"
 
-    # Site type from TYPE field
-    bldg_type = str(record.get("TYPE", "")).lower()
-    site_type = "commercial" if "commercial" in bldg_type else "commercial"
+    site_type = "commercial"
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
+    has_battery = has_battery_keyword(desc, desc_lower)
 
     inst = make_installation(
         source_id, config,
@@ -3457,48 +4086,38 @@ def transform_pittsburgh(record, data_source_id, config):
     module_count = None
     module_watts = None
 
+    desc_lower = desc.lower()
+
     # Try structured pattern: "(count) MANUFACTURER (watts) modules"
-    m = re.search(r'\((\d+)\)\s+([A-Z][A-Za-z\s]+?)\s*(?:\((\d+)[Ww]\))?\s*(?:solar\s+)?module', desc, re.IGNORECASE)
+    m = PITTSBURGH_MODULE_RE.search(desc)
     if m:
         module_count = int(m.group(1))
-        module_manufacturer = m.group(2).strip()
+        module_manufacturer = sys.intern(m.group(2).strip())
         if m.group(3):
             module_watts = int(m.group(3))
     else:
         # Try known manufacturer names
-        for mfr in ["JA Solar", "JA SOLAR", "Canadian Solar", "Hanwha", "Qcells", "Q CELLS", "REC",
-                     "LG", "SunPower", "Trina", "LONGi", "Jinko", "Silfab", "Mission Solar",
-                     "Panasonic", "Solaria", "Axitec", "Aptos", "Maxeon"]:
-            if mfr.lower() in desc.lower():
-                module_manufacturer = mfr
-                # Try to get model
-                pattern = re.compile(re.escape(mfr) + r'[\s:]+(\S+)', re.IGNORECASE)
-                mm = pattern.search(desc)
-                if mm:
-                    model_candidate = mm.group(1)
-                    # Only use if it looks like a model number (has digits)
-                    if re.search(r'\d', model_candidate):
-                        module_model = model_candidate
-                break
+        module_manufacturer = find_manufacturer(desc_lower, PITTSBURGH_PANEL_MANUFACTURERS)
+        if module_manufacturer:
+            # Try to get model
+            model_candidate = find_model_after(desc, desc_lower, module_manufacturer)
+            # Only use if it looks like a model number (has digits)
+            if model_candidate and DIGIT_RE.search(model_candidate):
+                module_model = model_candidate
 
     # Parse inverter: "(8) ENPHASE IQ7A microinverters" or "SolarEdge SE7600H"
     inv_manufacturer = None
     inv_model = None
     inv_count = None
-    m = re.search(r'\((\d+)\)\s+([A-Z][A-Za-z\s]+?)\s+(\S+)\s*(?:micro)?inverter', desc, re.IGNORECASE)
+    m = PITTSBURGH_INVERTER_RE.search(desc)
     if m:
         inv_count = int(m.group(1))
-        inv_manufacturer = m.group(2).strip()
+        inv_manufacturer = sys.intern(m.group(2).strip())
         inv_model = m.group(3).strip()
     else:
-        for mfr in ["SolarEdge", "Enphase", "SMA", "Fronius", "ABB", "Generac", "Tesla"]:
-            if mfr.lower() in desc.lower():
-                inv_manufacturer = mfr
-                pattern = re.compile(re.escape(mfr) + r'[\s:]+(\S+)', re.IGNORECASE)
-                mm = pattern.search(desc)
-                if mm:
-                    inv_model = mm.group(1)
-                break
+        inv_manufacturer = find_manufacturer(desc_lower, INVERTER_MANUFACTURERS)
+        if inv_manufacturer:
+            inv_model = find_model_after(desc, desc_lower, inv_manufacturer)
 
     if not module_count:
         panels, watts = parse_panels_from_description(desc)
@@ -3509,20 +4128,9 @@ def transform_pittsburgh(record, data_source_id, config):
     lat = safe_float(record.get("latitude"))
     lng = safe_float(record.get("longitude"))
 
-    # Mount type from description
-    mount_type = None
-    if re.search(r'ground\s*mount', desc, re.IGNORECASE):
-        mount_type = "ground_fixed"
-    elif re.search(r'roof\s*mount', desc, re.IGNORECASE):
-        mount_type = "rooftop"
-    elif re.search(r'carport', desc, re.IGNORECASE):
-        mount_type = "carport"
-
-    # Site type
-    comm_res = str(record.get("commercial_or_residential", "")).lower()
-    site_type = "commercial" if "commercial" in comm_res else "commercial"
+    site_type = "commercial"
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
+    has_battery = has_battery_keyword(desc, desc_lower)
 
     # Status mapping
     status = str(record.get("status", "")).lower()
@@ -3536,14 +4144,8 @@ def transform_pittsburgh(record, data_source_id, config):
     raw_addr = record.get("address", "") or ""
     addr, zipcode = raw_addr, None
     if raw_addr:
-        parts = [p.strip() for p in raw_addr.split(",")]
-        if parts:
-            addr = parts[0]
-        for part in reversed(parts):
-            m = re.search(r'(\d{5})', part)
-            if m:
-                zipcode = m.group(1)
-                break
+        addr = raw_addr.partition(",")[0].strip()
+        zipcode = zip_from_address(raw_addr)
 
     owner = record.get("owner_name", "")
     contractor = record.get("contractor_name", "")
@@ -3576,7 +4178,7 @@ def transform_pittsburgh(record, data_source_id, config):
         if module_model:
             eq["model"] = module_model
         if module_watts:
-            eq["specs"] = json.dumps({"watts": module_watts})
+            eq["specs"] = {"watts": module_watts}
         equipment.append(eq)
     if inv_count or inv_manufacturer:
         eq = {"equipment_type": "inverter"}
@@ -3603,25 +4205,16 @@ def transform_san_antonio(record, data_source_id, config):
     raw_addr = record.get("ADDRESS", "") or ""
     addr, city, zipcode = "", "San Antonio", ""
     if raw_addr:
-        parts = [p.strip() for p in raw_addr.split(",")]
-        if parts:
-            addr = parts[0]
+        addr = raw_addr.partition(",")[0].strip()
         # Extract zip from last part
-        for part in reversed(parts):
-            m = re.search(r'(\d{5})', part)
-            if m:
-                zipcode = m.group(1)
-                break
+        zipcode = zip_from_address(raw_addr) or ""
 
     installer = record.get("PRIMARY CONTACT", "") or ""
     project = record.get("PROJECT NAME", "") or ""
     cost = safe_float(record.get("DECLARED VALUATION"))
 
     # Parse capacity from project name if present
-    capacity_kw = parse_capacity_from_description(project)
-    panels, watts = parse_panels_from_description(project)
-
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', project, re.IGNORECASE))
+    capacity_kw, panels, watts, has_battery = parse_description(project)
 
     inst = make_installation(
         source_id, config,
@@ -3663,31 +4256,28 @@ def transform_la_county(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts, has_battery = parse_description(desc)
 
     lat = safe_float(record.get("_lat"))
     lng = safe_float(record.get("_lng"))
 
     # Extract mount type from WORKCLASS_NAME
     mount_type = None
-    wclass = record.get("WORKCLASS_NAME", "") or ""
-    if "ground mount" in wclass.lower():
-        if "utility" in wclass.lower():
+    wclass = (record.get("WORKCLASS_NAME", "") or "").lower()
+    if "ground mount" in wclass:
+        if "utility" in wclass:
             mount_type = "ground_single_axis"
         else:
             mount_type = "ground_fixed"
-    elif "roof mount" in wclass.lower():
+    elif "roof mount" in wclass:
         mount_type = "rooftop"
-    elif "carport" in wclass.lower():
+    elif "carport" in wclass:
         mount_type = "carport"
 
     site_type = "commercial"
-    if "utility" in wclass.lower():
+    if "utility" in wclass:
         site_type = "utility"
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
-
     inst = make_installation(
         source_id, config,
         address=record.get("MAIN_ADDRESS", ""),
@@ -3728,14 +4318,11 @@ def transform_las_vegas(record, data_source_id, config):
     if is_solar_false_positive(combined_desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(combined_desc)
-    panels, watts = parse_panels_from_description(combined_desc)
+    capacity_kw, panels, watts, has_battery = parse_description(combined_desc)
 
     lat = safe_float(record.get("_lat"))
     lng = safe_float(record.get("_lng"))
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', combined_desc, re.IGNORECASE))
-
     inst = make_installation(
         source_id, config,
         address=record.get("ADDR", "") or record.get("ADDRESS", ""),
@@ -3772,14 +4359,11 @@ def transform_baltimore(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts, has_battery = parse_description(desc)
 
     lat = safe_float(record.get("_lat"))
     lng = safe_float(record.get("_lng"))
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
-
     inst = make_installation(
         source_id, config,
         address=record.get("Address", ""),
@@ -3878,15 +4462,16 @@ def transform_charlotte(record, data_source_id, config):
     if not permit_id:
         return None, None, None
 
-    source_id = f"permit_charlotte_{permit_id}"
-
     # Get descriptions for solar keyword check and NLP
     workdesc = (record.get("workdesc") or record.get("WORKDESC") or "").strip()
     permitdesc = (record.get("permitdesc") or record.get("PERMITDESC") or "").strip()
     desc = workdesc or permitdesc or ""
 
-    # Filter: must mention solar/photovoltaic somewhere
-    combined = f"{workdesc} {permitdesc}".upper()
+    # Filter: must mention solar/photovoltaic somewhere.
+    # upper() maps each character on its own, so the per-field copies can be joined.
+    workdesc_upper = workdesc.upper()
+    permitdesc_upper = permitdesc.upper()
+    combined = f"{workdesc_upper} {permitdesc_upper}"
     if not any(kw in combined for kw in ["SOLAR", "PHOTOVOLTAIC", "PV SYSTEM", "PV ARRAY"]):
         return None, None, None
 
@@ -3894,13 +4479,15 @@ def transform_charlotte(record, data_source_id, config):
     if is_solar_false_positive(f"{workdesc} {permitdesc}"):
         return None, None, None
 
+    source_id = f"permit_charlotte_{permit_id}"
+
     # Owner name from ownname field
     owner = (record.get("ownname") or record.get("OWNNAME") or "").strip()
 
     # Installer often in permitdesc or workdesc (e.g. "Titan Solar Power NC Inc")
     installer = None
     # If permitdesc looks like a company name (not a description), it might be installer
-    if permitdesc and not any(kw in permitdesc.upper() for kw in ["INSTALL", "MOUNT", "ROOF", "SYSTEM", "PANEL", "KW"]):
+    if permitdesc and not any(kw in permitdesc_upper for kw in ("INSTALL", "MOUNT", "ROOF", "SYSTEM", "PANEL", "KW")):
         # It's likely just a company name
         installer = permitdesc
 
@@ -3927,14 +4514,7 @@ def transform_charlotte(record, data_source_id, config):
         capacity_kw = parse_capacity_from_description(permitdesc)
 
     # Mount type detection
-    mount_type = None
-    upper_desc = desc.upper()
-    if "GROUND" in upper_desc or "GROUND-MOUNT" in upper_desc:
-        mount_type = "ground"
-    elif "ROOF" in upper_desc or "ROOFTOP" in upper_desc:
-        mount_type = "rooftop"
-    elif "CARPORT" in upper_desc or "CANOPY" in upper_desc:
-        mount_type = "carport"
+    mount_type = mount_type_from_keywords(workdesc_upper if workdesc else permitdesc_upper)
 
     # City from taxjuris or default
     city = (record.get("taxjuris") or record.get("TAXJURIS") or "Charlotte").strip().title()
@@ -3998,17 +4578,11 @@ def transform_nashville(record, data_source_id, config):
     capacity_kw = parse_capacity_from_description(purpose)
 
     # Mount type detection from Purpose
-    mount_type = None
-    upper_purpose = purpose.upper()
-    if "GROUND" in upper_purpose:
-        mount_type = "ground"
-    elif "ROOF" in upper_purpose or "ROOFTOP" in upper_purpose:
-        mount_type = "rooftop"
-    elif "CARPORT" in upper_purpose or "CANOPY" in upper_purpose:
-        mount_type = "carport"
+    mount_type = mount_type_from_keywords(purpose.upper())
 
     # Battery detection from Purpose
-    has_battery = bool(re.search(r'powerwall|battery|energy\s+storage|ess|kwh', purpose, re.IGNORECASE))
+    has_battery = bool(keyword_search(
+        NASHVILLE_BATTERY_RE, purpose, purpose.lower(), ("powerwall", "battery", "storage", "ess", "kwh")))
 
     # Cost
     cost = safe_float(record.get("Contract_Value"))
@@ -4033,29 +4607,17 @@ def transform_nashville(record, data_source_id, config):
     # Extract equipment from Purpose field
     equip = []
     # Panel pattern: "7 SILFAB SOLAR SIL-430 QD" or "20 LG LG400N2W panels"
-    m = re.search(r'(\d+)\s*(?:x\s*)?([A-Z][A-Za-z\s]+?)\s+(\S+)\s+(?:\d+[Ww]|panel|module)', purpose, re.IGNORECASE)
+    m = NASHVILLE_MODULE_RE.search(purpose)
     if m:
-        equip.append({
-            "equipment_type": "module",
-            "manufacturer": m.group(2).strip(),
-            "model": m.group(3).strip(),
-        })
+        equip.append(equipment_from_match(m, "module", 2))
     # Inverter pattern: "Enphase IQ8PLUS-72-2-US" or "SolarEdge SE7600H"
-    m = re.search(r'(Enphase|SolarEdge|SMA|Fronius|Tesla|Generac|Huawei|GoodWe|Delta|Sungrow)\s+([A-Z0-9][\w\-\.]+)', purpose, re.IGNORECASE)
+    m = NASHVILLE_INVERTER_RE.search(purpose)
     if m:
-        equip.append({
-            "equipment_type": "inverter",
-            "manufacturer": m.group(1).strip(),
-            "model": m.group(2).strip(),
-        })
+        equip.append(equipment_from_match(m, "inverter"))
     # Racking pattern: "Unirac NXT" or "IronRidge XR100"
-    m = re.search(r'(Unirac|IronRidge|SnapNrack|Quick\s*Mount|Pegasus|Everest)\s+([A-Z0-9][\w\-\.]+)', purpose, re.IGNORECASE)
+    m = NASHVILLE_RACKING_RE.search(purpose)
     if m:
-        equip.append({
-            "equipment_type": "racking",
-            "manufacturer": m.group(1).strip(),
-            "model": m.group(2).strip(),
-        })
+        equip.append(equipment_from_match(m, "racking"))
 
     return source_id, inst, equip if equip else None
 
@@ -4068,21 +4630,22 @@ def transform_portland(record, data_source_id, config):
     if not permit_id:
         return None, None, None
 
-    source_id = f"permit_portland_{permit_id}"
-
     desc = (record.get("DESCRIPTION") or "").strip()
     work_desc = (record.get("WORK_DESCRIPTION") or "").strip()
     combined_desc = f"{desc} {work_desc}".strip()
 
     # Must mention solar
-    if not re.search(r'solar|photovoltaic|pv\s+(system|module|panel|array)', combined_desc, re.IGNORECASE):
+    if not has_solar_keyword(combined_desc):
         return None, None, None
     if is_solar_false_positive(combined_desc):
         return None, None, None
     # Exclude "solarium" false positives
-    if re.search(r'\bsolarium\b', combined_desc, re.IGNORECASE):
+    combined_lower = combined_desc.lower()
+    if keyword_search(SOLARIUM_RE, combined_desc, combined_lower, ("solarium",)):
         return None, None, None
 
+    source_id = f"permit_portland_{permit_id}"
+
     # Address from HOUSE + PROPSTREET
     house = (record.get("HOUSE") or "").strip()
     street = (record.get("PROPSTREET") or "").strip()
@@ -4097,14 +4660,7 @@ def transform_portland(record, data_source_id, config):
     cost = safe_float(record.get("SUBMITTEDVALUATION"))
 
     # Mount type
-    mount_type = None
-    upper_desc = combined_desc.upper()
-    if "GROUND" in upper_desc or "GROUND-MOUNT" in upper_desc:
-        mount_type = "ground"
-    elif "ROOF" in upper_desc or "ROOFTOP" in upper_desc:
-        mount_type = "rooftop"
-    elif "CARPORT" in upper_desc or "CANOPY" in upper_desc:
-        mount_type = "carport"
+    mount_type = mount_type_from_keywords(combined_desc.upper())
 
     # Site type
     status = (record.get("STATUS") or "").upper()
@@ -4128,21 +4684,13 @@ def transform_portland(record, data_source_id, config):
     # Equipment extraction from descriptions
     equip = []
     # Parse module manufacturer + model
-    m = re.search(r'(\d+)\s*(?:x\s*)?([A-Z][A-Za-z\s]+?)\s+(\S+)\s+(\d+)[Ww]\s*(?:solar\s+)?(?:module|panel)', combined_desc, re.IGNORECASE)
+    m = keyword_search(PORTLAND_MODULE_RE, combined_desc, combined_lower, ("module", "panel"))
     if m:
-        equip.append({
-            "equipment_type": "module",
-            "manufacturer": m.group(2).strip(),
-            "model": m.group(3).strip(),
-        })
+        equip.append(equipment_from_match(m, "module", 2))
     # Parse inverter
-    m = re.search(r'([A-Z][A-Za-z]+)\s+(\S+)\s+(?:inverter|micro-?inverter)', combined_desc, re.IGNORECASE)
+    m = keyword_search(MAKE_MODEL_INVERTER_RE, combined_desc, combined_lower, ("inverter",))
     if m:
-        equip.append({
-            "equipment_type": "inverter",
-            "manufacturer": m.group(1).strip(),
-            "model": m.group(2).strip(),
-        })
+        equip.append(equipment_from_match(m, "inverter"))
 
     return source_id, inst, equip if equip else None
 
@@ -4153,18 +4701,17 @@ def transform_tampa(record, data_source_id, config):
     if not permit_num:
         return None, None, None
 
-    source_id = f"permit_tampa_{permit_num}"
-
     desc = record.get("Description", "") or record.get("description", "") or ""
 
     # Filter: must mention solar/PV
-    if not re.search(r'solar|photovoltaic|pv\s+(system|module|panel|array)', desc, re.IGNORECASE):
+    if not has_solar_keyword(desc):
         return None, None, None
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    source_id = f"permit_tampa_{permit_num}"
+
+    capacity_kw, panels, watts = parse_capacity_and_panels(desc)
 
     # Address
     address = (record.get("OriginalAddress1") or record.get("originaladdress1") or "").strip()
@@ -4196,38 +4743,26 @@ def transform_tampa(record, data_source_id, config):
     )
 
     # Mount type from description
-    mount_type = None
-    upper_desc = desc.upper()
-    if "GROUND" in upper_desc:
-        mount_type = "ground"
-    elif "ROOF" in upper_desc:
-        mount_type = "rooftop"
-    elif "CARPORT" in upper_desc or "CANOPY" in upper_desc:
-        mount_type = "carport"
+    mount_type = mount_type_from_keywords(desc.upper())
     inst["mount_type"] = mount_type
 
     # Equipment extraction from rich descriptions
     equip = []
     # Parse module: "(26) Canadian Solar CS3W-445 445W"
-    m = re.search(r'\((\d+)\)\s+([A-Z][A-Za-z\s]+?)\s+(\S+)\s+(\d+)[Ww]\s*(?:solar\s+)?(?:module|panel)?', desc, re.IGNORECASE)
-    if not m:
-        m = re.search(r'(\d+)\s+([A-Z][A-Za-z\s]+?)\s+(\S+)\s+(\d+)[Ww]', desc, re.IGNORECASE)
+    for pattern in TAMPA_MODULE_RES:
+        m = pattern.search(desc)
+        if m:
+            break
     if m:
-        equip.append({
-            "equipment_type": "module",
-            "manufacturer": m.group(2).strip(),
-            "model": m.group(3).strip(),
-        })
+        equip.append(equipment_from_match(m, "module", 2))
     # Parse inverter: "Enphase IQ7A" or "SolarEdge SE6000H-US inverter"
-    m = re.search(r'([A-Z][A-Za-z]+)\s+(\S+)\s+(?:inverter|micro-?inverter)', desc, re.IGNORECASE)
-    if not m:
-        m = re.search(r'([A-Z][A-Za-z]+)\s+(\S+)\s+\d+\.?\d*\s*kw\s*\(?AC', desc, re.IGNORECASE)
+    desc_lower = desc.lower()
+    for pattern, keywords in TAMPA_INVERTER_RES:
+        m = keyword_search(pattern, desc, desc_lower, keywords)
+        if m:
+            break
     if m:
-        equip.append({
-            "equipment_type": "inverter",
-            "manufacturer": m.group(1).strip(),
-            "model": m.group(2).strip(),
-        })
+        equip.append(equipment_from_match(m, "inverter"))
 
     return source_id, inst, equip if equip else None
 
@@ -4238,18 +4773,17 @@ def transform_leon_county(record, data_source_id, config):
     if not permit_num:
         return None, None, None
 
-    source_id = f"permit_leon_{permit_num}"
-
     desc = record.get("Description", "") or record.get("description", "") or ""
 
     # Filter: must mention solar/PV
-    if not re.search(r'solar|photovoltaic|pv\s+(system|module|panel|array)', desc, re.IGNORECASE):
+    if not has_solar_keyword(desc):
         return None, None, None
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    source_id = f"permit_leon_{permit_num}"
+
+    capacity_kw, panels, watts = parse_capacity_and_panels(desc)
 
     # Address
     address = (record.get("OriginalAddress1") or record.get("originaladdress1") or "").strip()
@@ -4263,9 +4797,7 @@ def transform_leon_county(record, data_source_id, config):
 
     contractor = (record.get("ContractorCompanyName") or record.get("contractorcompanyname") or "").strip()
 
-    # Site type from PermitClass
-    permit_class = (record.get("PermitClass") or record.get("permitclass") or "").upper()
-    site_type = "commercial" if "COMMERCIAL" in permit_class else "commercial"
+    site_type = "commercial"
 
     inst = make_installation(
         source_id, config,
@@ -4284,14 +4816,7 @@ def transform_leon_county(record, data_source_id, config):
     )
 
     # Mount type from description
-    mount_type = None
-    upper_desc = desc.upper()
-    if "GROUND" in upper_desc:
-        mount_type = "ground"
-    elif "ROOF" in upper_desc:
-        mount_type = "rooftop"
-    elif "CARPORT" in upper_desc or "CANOPY" in upper_desc:
-        mount_type = "carport"
+    mount_type = mount_type_from_keywords(desc.upper())
     inst["mount_type"] = mount_type
 
     # Equipment from description
@@ -4317,73 +4842,60 @@ def transform_virginia_beach(record, data_source_id, config):
     if not permit_num:
         return None, None, None
 
-    source_id = f"permit_vabeach_{permit_num}"
     desc = record.get("WorkDesc", "") or record.get("workdesc", "") or ""
 
-    if not re.search(r'solar|photovoltaic|pv\s+(system|module|panel|array)', desc, re.IGNORECASE):
+    if not has_solar_keyword(desc):
         return None, None, None
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    source_id = f"permit_vabeach_{permit_num}"
+
+    capacity_kw, panels, watts, has_battery = parse_description(desc)
 
     # Parse manufacturer + model from description
     module_manufacturer = None
     module_model = None
     module_count = panels
+    desc_lower = desc.lower()
 
-    m = re.search(r'\((\d+)\)\s+([A-Z][A-Za-z\s]+?)\s+(\S+)\s+(\d+)[Ww]\s*(?:solar\s+)?module', desc, re.IGNORECASE)
+    m = VIRGINIA_BEACH_MODULE_RE.search(desc)
     if m:
         module_count = int(m.group(1))
-        module_manufacturer = m.group(2).strip()
+        module_manufacturer = sys.intern(m.group(2).strip())
         module_model = m.group(3).strip()
         watts = int(m.group(4))
     else:
-        for mfr in ["REC", "JA Solar", "JA SOLAR", "Canadian Solar", "Hanwha", "Qcells", "Q CELLS",
-                     "LG", "SunPower", "Trina", "LONGi", "Jinko", "Silfab", "Mission Solar",
-                     "Panasonic", "Solaria", "Axitec", "Aptos", "Maxeon"]:
-            if mfr.lower() in desc.lower():
-                module_manufacturer = mfr
-                pattern = re.compile(re.escape(mfr) + r'[\s:]+(\S+)', re.IGNORECASE)
-                mm = pattern.search(desc)
-                if mm:
-                    model_candidate = mm.group(1)
-                    if re.search(r'\d', model_candidate):
-                        module_model = model_candidate
-                break
+        module_manufacturer = find_manufacturer(desc_lower, VIRGINIA_BEACH_PANEL_MANUFACTURERS)
+        if module_manufacturer:
+            model_candidate = find_model_after(desc, desc_lower, module_manufacturer)
+            if model_candidate and DIGIT_RE.search(model_candidate):
+                module_model = model_candidate
 
     # Parse inverter
     inv_manufacturer = None
     inv_model = None
     inv_count = None
-    m = re.search(r'(?:\((\d+)\)\s+)?([A-Z][A-Za-z]+(?:Edge)?)\s+(\S+)\s*(?:micro)?inverter', desc, re.IGNORECASE)
+    m = keyword_search(VIRGINIA_BEACH_INVERTER_RE, desc, desc_lower, ("inverter",))
     if m:
         if m.group(1):
             inv_count = int(m.group(1))
-        inv_manufacturer = m.group(2).strip()
+        inv_manufacturer = sys.intern(m.group(2).strip())
         inv_model = m.group(3).strip()
     else:
-        for mfr in ["SolarEdge", "Enphase", "SMA", "Fronius", "ABB", "Generac", "Tesla"]:
-            if mfr.lower() in desc.lower():
-                inv_manufacturer = mfr
-                pattern = re.compile(re.escape(mfr) + r'[\s:]+(\S+)', re.IGNORECASE)
-                mm = pattern.search(desc)
-                if mm:
-                    inv_model = mm.group(1)
-                break
+        inv_manufacturer = find_manufacturer(desc_lower, INVERTER_MANUFACTURERS)
+        if inv_manufacturer:
+            inv_model = find_model_after(desc, desc_lower, inv_manufacturer)
 
     # Mount type
     mount_type = None
-    if re.search(r'ground\s*mount', desc, re.IGNORECASE):
+    if "ground" in desc_lower and GROUND_MOUNT_RE.search(desc):
         mount_type = "ground_fixed"
-    elif re.search(r'roof\s*mount', desc, re.IGNORECASE):
+    elif "roof" in desc_lower and ROOF_MOUNT_RE.search(desc):
         mount_type = "rooftop"
-    elif re.search(r'carport', desc, re.IGNORECASE):
+    elif "carport" in desc_lower:
         mount_type = "carport"
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', desc, re.IGNORECASE))
-
     addr = record.get("StreetAddress", "") or record.get("streetaddress", "")
     city_val = record.get("City", "") or record.get("city", "") or "Virginia Beach"
     zip_val = record.get("Zip", "") or record.get("zip", "")
@@ -4419,24 +4931,22 @@ def transform_boston_ckan(record, data_source_id, config):
     if not permit_num:
         return None, None, None
 
-    source_id = f"permit_boston_ckan_{permit_num}"
     desc = record.get("Comments", "") or record.get("comments", "") or record.get("COMMENTS", "") or ""
     work_type = record.get("WorkType", "") or record.get("worktype", "") or ""
     combined_desc = f"{work_type} {desc}".strip()
 
-    if not re.search(r'solar|photovoltaic|pv\s+(system|module|panel)', combined_desc, re.IGNORECASE):
+    if not has_solar_keyword(combined_desc, BOSTON_SOLAR_KEYWORD_RE):
         return None, None, None
     if is_solar_false_positive(combined_desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(combined_desc)
-    panels, watts = parse_panels_from_description(combined_desc)
+    source_id = f"permit_boston_ckan_{permit_num}"
+
+    capacity_kw, panels, watts, has_battery = parse_description(combined_desc)
 
     lat = safe_float(record.get("Latitude") or record.get("latitude") or record.get("Y"))
     lng = safe_float(record.get("Longitude") or record.get("longitude") or record.get("X"))
 
-    has_battery = bool(re.search(r'storage|battery|powerwall|bess', combined_desc, re.IGNORECASE))
-
     inst = make_installation(
         source_id, config,
         address=record.get("Address", "") or record.get("address", ""),
@@ -4621,8 +5131,7 @@ def transform_cambridge_installations(record, data_source_id, config):
     system_id = record.get("systemid", "")
     source_id = f"cambridge_solar_{system_id}" if system_id else f"cambridge_solar_{address.replace(' ', '_')}_{kw or 0}"
 
-    building_type = str(record.get("buildingtype", "")).lower()
-    site_type = "commercial" if any(x in building_type for x in ("commercial", "industrial", "municipal", "institutional")) else "commercial"
+    site_type = "commercial"
 
     lat = safe_float(record.get("latitude"))
     lng = safe_float(record.get("longitude"))
@@ -4652,24 +5161,24 @@ def transform_san_diego_county(record, data_source_id, config):
     if not record_id:
         return None, None, None
 
-    source_id = f"permit_sdcounty_{record_id}"
-
     use_field = record.get("use", "") or ""
     scope_code = record.get("primary_scope_code", "") or ""
 
     # Filter: must be solar scope code 8004
-    if "8004" not in scope_code and not re.search(r'solar|photovoltaic|pv', use_field, re.IGNORECASE):
+    if "8004" not in scope_code and not has_solar_keyword(use_field, SAN_DIEGO_SOLAR_RE):
         return None, None, None
     if is_solar_false_positive(use_field):
         return None, None, None
 
+    source_id = f"permit_sdcounty_{record_id}"
+
     # Parse capacity from structured fields
     capacity_kw = None
-    m = re.search(r'TOTAL\s+SYSTEM\s+SIZE\s+(?:IN\s+)?KILOWATTS?\s*:?\s*([\d,]+\.?\d*)', use_field, re.IGNORECASE)
+    m = SAN_DIEGO_SYSTEM_SIZE_RE.search(use_field)
     if m:
         capacity_kw = float(m.group(1).replace(",", ""))
     if not capacity_kw:
-        m = re.search(r'([\d,]+\.?\d*)\s*MW', use_field, re.IGNORECASE)
+        m = SAN_DIEGO_MW_RE.search(use_field)
         if m:
             capacity_kw = float(m.group(1).replace(",", "")) * 1000
     if not capacity_kw:
@@ -4677,13 +5186,13 @@ def transform_san_diego_county(record, data_source_id, config):
 
     # Parse module count
     module_count = None
-    m = re.search(r'NO\.?\s*OF\s+MODULES?\s*:?\s*(\d+)', use_field, re.IGNORECASE)
+    m = SAN_DIEGO_MODULES_RE.search(use_field)
     if m:
         module_count = int(m.group(1))
 
     # Parse inverter count
     inverter_count = None
-    m = re.search(r'NO\.?\s*OF\s+INVERTERS?\s*:?\s*(\d+)', use_field, re.IGNORECASE)
+    m = SAN_DIEGO_INVERTERS_RE.search(use_field)
     if m:
         inverter_count = int(m.group(1))
 
@@ -4760,8 +5269,7 @@ def transform_richmond_va(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts = parse_capacity_and_panels(desc)
 
     # Coordinates from geocoded_column Point
     lat = None
@@ -4782,9 +5290,7 @@ def transform_richmond_va(record, data_source_id, config):
     zip_code = record.get("site_zip", "") or ""
     cost = safe_float(record.get("jobvalue"))
 
-    # Determine site type from type field
-    ptype = str(record.get("type", "")).upper()
-    site_type = "commercial" if "COMMERCIAL" in ptype else "commercial"
+    site_type = "commercial"
 
     inst = make_installation(
         source_id, config,
@@ -4853,7 +5359,7 @@ def transform_ny_large_renewable(record, data_source_id, config):
 
     # Use project name + developer as unique key
     developer = record.get("developer_name", "") or record.get("seller_lead_party", "") or ""
-    key = re.sub(r'[^a-z0-9]', '_', project_name.lower())[:60]
+    key = NON_ALNUM_RE.sub('_', project_name.lower())[:60]
     source_id = f"nyserda_lsr_{key}"
 
     capacity_mw = safe_float(record.get("new_renewable_capacity_mw"))
@@ -4905,7 +5411,7 @@ def transform_virginia_deq(record, data_source_id, config):
     if "solar" not in energy_type and "photovoltaic" not in energy_type:
         return None, None, None
 
-    key = re.sub(r'[^a-z0-9]', '_', project_name.lower())[:60]
+    key = NON_ALNUM_RE.sub('_', project_name.lower())[:60]
     source_id = f"vadeq_{key}"
 
     capacity_mw = safe_float(record.get("capacity_mw") or record.get("nameplate_capacity_mw"))
@@ -4939,8 +5445,7 @@ def transform_memphis(record, data_source_id, config):
     if is_solar_false_positive(desc):
         return None, None, None
 
-    capacity_kw = parse_capacity_from_description(desc)
-    panels, watts = parse_panels_from_description(desc)
+    capacity_kw, panels, watts = parse_capacity_and_panels(desc)
 
     # Coordinates
     lat = safe_float(record.get("lat"))
@@ -5036,7 +5541,7 @@ def transform_md_clean_energy(record, data_source_id, config):
 
     # Build unique key from city+zip+capacity+date
     key = f"{city}_{zip_code}_{capacity}_{award_date}"
-    key = re.sub(r'[^a-z0-9]', '_', key.lower())[:60]
+    key = NON_ALNUM_RE.sub('_', key.lower())[:60]
     source_id = f"md_ceg_{key}"
 
     capacity_kw = capacity if capacity else None
@@ -5134,8 +5639,101 @@ TRANSFORMERS = {
 # Main ingestion loop
 # ---------------------------------------------------------------------------
 
-def ingest_city(city_key, config, dry_run=False):
-    """Ingest permits for a single city."""
+transform_pool = None  # ProcessPoolExecutor shared across cities, started lazily
+transform_pool_lock = threading.Lock()
+
+
+def track_fetch(pages, status):
+    """Yield a fetcher's pages, then store its return value in status["complete"]."""
+    status["complete"] = yield from pages
+
+
+def iter_batches(pages, size):
+    """Regroup fetched pages into lists of at least size records (the last may be shorter)."""
+    batch = []
+    for page in pages:
+        batch.extend(page)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def transform_records(raw_records, transform_fn, data_source_id, config):
+    """Run a city transformer over a list of raw records; results are in input order.
+
+    Transforms are pure string work, so large lists are spread across a
+    process pool rather than threads. The pool is started on first use and
+    reused for every later batch and city in the run. Its workers are
+    spawned, not forked: the first use can come from a --workers city
+    thread while other threads hold locks, which a forked child would
+    inherit locked.
+    """
+    global transform_pool
+    if TRANSFORM_WORKERS > 1 and len(raw_records) >= TRANSFORM_POOL_MIN:
+        with transform_pool_lock:
+            if transform_pool is None:
+                transform_pool = ProcessPoolExecutor(
+                    max_workers=TRANSFORM_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        fn = partial(transform_fn, data_source_id=data_source_id, config=config)
+        return list(transform_pool.map(fn, raw_records, chunksize=TRANSFORM_CHUNK_SIZE))
+    return [transform_fn(raw, data_source_id, config) for raw in raw_records]
+
+
+# When cities are ingested in parallel (--workers), each city's prints are
+# collected in its own buffer and written out as one block when it finishes.
+city_output = threading.local()
+
+
+class CityOutputRouter:
+    """sys.stdout stand-in that sends a thread's prints to its city buffer, if any.
+
+    Everything other than write/flush (encoding, isatty, fileno, buffer, ...)
+    is answered by the real stream.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+    def write(self, text):
+        return (getattr(city_output, "buffer", None) or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def with_city_output(buffer, fn, *args):
+    """Call fn(*args) with this thread's prints going to buffer (None = stdout)."""
+    city_output.buffer = buffer
+    try:
+        return fn(*args)
+    finally:
+        city_output.buffer = None
+
+
+def ingest_city_buffered(city_key, config, dry_run, watermarks, full=False):
+    """Run ingest_city with its output collected; returns (created, errors, output)."""
+    buffer = io.StringIO()
+    try:
+        created, errors = with_city_output(buffer, ingest_city, city_key, config, dry_run, watermarks, full)
+    except BaseException:
+        print(buffer.getvalue(), end="")
+        raise
+    return created, errors, buffer.getvalue()
+
+
+def ingest_city(city_key, config, dry_run=False, watermarks=None, full=False):
+    """Ingest permits for a single city.
+
+    If watermarks is given and the config has a date_field, only records
+    issued since the saved watermark are fetched, and the watermark is
+    advanced after a complete fetch and an error-free insert. With full,
+    the whole history is fetched but the watermark is still advanced.
+    """
     print(f"\n{'=' * 60}")
     print(f"Processing {config['name']}")
     print(f"{'=' * 60}")
@@ -5143,71 +5741,91 @@ def ingest_city(city_key, config, dry_run=False):
     print(f"  Prefix: {config['prefix']}")
     print(f"  Transform: {config['transform']}")
 
-    # Fetch records from API
-    print(f"\n  Downloading records...")
-    try:
-        platform = config["platform"]
-        if platform == "opendatasoft":
-            raw_records = fetch_opendatasoft(config)
-        elif platform == "arcgis_multilayer":
-            raw_records = fetch_arcgis_multilayer(config)
-        elif platform == "arcgis":
-            raw_records = fetch_arcgis(config)
-        elif platform == "carto":
-            raw_records = fetch_carto(config)
-        elif platform == "ckan":
-            raw_records = fetch_ckan(config)
-        else:
-            raw_records = fetch_socrata(config)
-    except Exception as e:
-        print(f"  ERROR fetching data: {e}")
-        return 0, 0
-    print(f"  Downloaded: {len(raw_records)} records")
-
-    if not raw_records:
-        print("  No records found!")
-        return 0, 0
-
-    # Get data source ID
-    ds_name = f"municipal_permits_{city_key}"
-    if not dry_run:
-        data_source_id = get_data_source_id(ds_name)
+    date_field = config.get("date_field") if watermarks is not None else None
+    watermark = watermarks.get(config["prefix"]) if date_field and not full else None
+    fetch_config = apply_watermark(config, watermark) if watermark else config
+    if watermark:
+        print(f"  Delta: {date_field} >= {watermark}")
+
+    platform = config["platform"]
+    if platform == "opendatasoft":
+        pages = fetch_opendatasoft(fetch_config)
+    elif platform == "arcgis_multilayer":
+        pages = fetch_arcgis_multilayer(fetch_config)
+    elif platform == "arcgis":
+        pages = fetch_arcgis(fetch_config)
+    elif platform == "carto":
+        pages = fetch_carto(fetch_config)
+    elif platform == "ckan":
+        pages = fetch_ckan(fetch_config)
     else:
-        data_source_id = "dry-run"
+        pages = fetch_socrata(fetch_config)
+    fetch_status = {}
+    pages = track_fetch(pages, fetch_status)
 
-    # Get existing source IDs to skip duplicates
-    if not dry_run:
-        existing_ids = get_existing_source_ids(config["prefix"])
-        print(f"  Existing records: {len(existing_ids)}")
-    else:
-        existing_ids = set()
-
-    # Transform records
+    # Records are transformed batch by batch as pages arrive, so only one
+    # batch of raw records is held in memory at a time
+    print(f"\n  Downloading records...")
+    batches = iter_batches(pages, TRANSFORM_POOL_MIN)
     transform_fn = TRANSFORMERS[config["transform"]]
+    downloaded = 0
+    newest = None
     installations = []
     equipment_batches = []  # [(installation_source_id, [equipment_records])]
     skipped_dup = 0
     skipped_invalid = 0
 
     seen_ids = set()
-    for raw in raw_records:
-        result = transform_fn(raw, data_source_id, config)
-        if len(result) == 3:
-            source_id, inst, equip = result
-        else:
-            source_id, inst = result
-            equip = None
+    while True:
+        try:
+            raw_records = next(batches, None)
+        except Exception as e:
+            print(f"  ERROR fetching data: {e}")
+            return 0, 0
+        if raw_records is None:
+            break
 
-        if not source_id or not inst:
-            skipped_invalid += 1
-            continue
-        if source_id in existing_ids or source_id in seen_ids:
-            skipped_dup += 1
-            continue
-        seen_ids.add(source_id)
-        installations.append(inst)
-        if equip:
-            equipment_batches.append((source_id, equip))
+        if not downloaded:
+            # Get data source ID
+            ds_name = f"municipal_permits_{city_key}"
+            if not dry_run:
+                data_source_id = get_data_source_id(ds_name)
+            else:
+                data_source_id = "dry-run"
+
+            # Get existing source IDs to skip duplicates
+            if not dry_run:
+                existing_ids = get_existing_source_ids(config["prefix"])
+                print(f"  Existing records: {len(existing_ids)}")
+            else:
+                existing_ids = set()
+        downloaded += len(raw_records)
+        if date_field:
+            newest = newest_issue_date(raw_records, date_field, newest)
+
+        # Transform records
+        for result in transform_records(raw_records, transform_fn, data_source_id, config):
+            if len(result) == 3:
+                source_id, inst, equip = result
+            else:
+                source_id, inst = result
+                equip = None
+
+            if not source_id or not inst:
+                skipped_invalid += 1
+                continue
+            if source_id in existing_ids or source_id in seen_ids:
+                skipped_dup += 1
+                continue
+            seen_ids.add(source_id)
+            installations.append(inst)
+            if equip:
+                equipment_batches.append((source_id, equip))
+
+    print(f"  Downloaded: {downloaded} records")
+    if not downloaded:
+        print("  No records found!")
+        return 0, 0
 
     print(f"  Transformed: {len(installations)}")
     print(f"  Skipped (duplicate): {skipped_dup}")
@@ -5221,8 +5839,16 @@ def ingest_city(city_key, config, dry_run=False):
             print(f"    {inst['source_record_id']} | {inst.get('address', 'N/A')} | {inst.get('capacity_mw', 'N/A')} MW | {inst.get('installer_name', 'N/A')}")
         return len(installations), 0
 
+    # A fetch cut short by an API error may be missing rows older than
+    # newest, so it must not move the watermark past them
+    fetched_all = fetch_status.get("complete", False)
+    if date_field and not fetched_all:
+        print("  Watermark not advanced: fetch incomplete")
+
     if not installations:
         print("  No new records to ingest.")
+        if date_field and fetched_all:
+            advance_watermark(watermarks, config, newest)
         return 0, 0
 
     # Batch insert installations
@@ -5244,21 +5870,34 @@ def ingest_city(city_key, config, dry_run=False):
     print(f"  Created: {created}")
     print(f"  Errors: {errors}")
 
+    if date_field and fetched_all and errors == 0:
+        advance_watermark(watermarks, config, newest)
+
     # Insert equipment if any
     if equipment_batches and created > 0:
         print(f"\n  Inserting equipment for {len(equipment_batches)} installations...")
         eq_created = 0
         eq_errors = 0
-        for source_id, equip_list in equipment_batches:
-            # Look up installation ID
+        # Look up installation IDs a chunk of source IDs at a time
+        inst_ids = {}
+        source_ids = [source_id for source_id, _ in equipment_batches]
+        for i in range(0, len(source_ids), EQUIPMENT_LOOKUP_CHUNK):
+            chunk = source_ids[i:i + EQUIPMENT_LOOKUP_CHUNK]
             rows = supabase_get("solar_installations", {
-                "select": "id",
-                "source_record_id": f"eq.{source_id}",
-                "limit": 1,
+                "select": "id,source_record_id",
+                "source_record_id": f"in.({','.join(postgrest_quote(s) for s in chunk)})",
             })
-            if not rows:
+            for r in rows:
+                inst_ids.setdefault(r["source_record_id"], r["id"])
+
+        # Bulk inserts need the same keys in every row, so rows with specs are
+        # batched separately (rows without keep the column default)
+        with_specs = []
+        without_specs = []
+        for source_id, equip_list in equipment_batches:
+            inst_id = inst_ids.get(source_id)
+            if not inst_id:
                 continue
-            inst_id = rows[0]["id"]
             for eq in equip_list:
                 eq_record = {
                     "installation_id": inst_id,
@@ -5270,11 +5909,17 @@ def ingest_city(city_key, config, dry_run=False):
                 }
                 if eq.get("specs"):
                     eq_record["specs"] = json.dumps(eq["specs"])
-                ok, err = supabase_post("solar_equipment", [eq_record])
+                    with_specs.append(eq_record)
+                else:
+                    without_specs.append(eq_record)
+        for eq_records in (with_specs, without_specs):
+            for i in range(0, len(eq_records), BATCH_SIZE):
+                batch = eq_records[i:i + BATCH_SIZE]
+                ok, err = supabase_post("solar_equipment", batch)
                 if ok:
-                    eq_created += 1
+                    eq_created += len(batch)
                 else:
-                    eq_errors += 1
+                    eq_errors += len(batch)
         print(f"  Equipment created: {eq_created}, errors: {eq_errors}")
 
     return created, errors
@@ -5286,6 +5931,8 @@ def main():
     parser.add_argument("--city", type=str, help="City key(s), comma-separated")
     parser.add_argument("--tier", type=str, help="Tier(s) to process, comma-separated (1,2,3,4)")
     parser.add_argument("--list-cities", action="store_true", help="List available cities")
+    parser.add_argument("--full", action="store_true", help="Refetch full history; saved watermarks can move forward but not back")
+    parser.add_argument("--workers", type=int, default=1, help="Cities to ingest concurrently (default 1)")
     args = parser.parse_args()
 
     if args.list_cities:
@@ -5322,11 +5969,34 @@ def main():
 
     total_created = 0
     total_errors = 0
+    # Loaded even with --full, so saving one city's watermark keeps the others
+    watermarks = load_watermarks()
 
-    for key, config in cities_to_process.items():
-        created, errors = ingest_city(key, config, args.dry_run)
-        total_created += created
-        total_errors += errors
+    try:
+        if args.workers > 1:
+            # Cities are independent and network-bound; overlap them, printing
+            # each city's log as a block once it finishes
+            sys.stdout = CityOutputRouter(sys.stdout)
+            with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                futures = [
+                    executor.submit(ingest_city_buffered, key, config, args.dry_run, watermarks, args.full)
+                    for key, config in cities_to_process.items()
+                ]
+                for future in as_completed(futures):
+                    created, errors, output = future.result()
+                    print(output, end="")
+                    total_created += created
+                    total_errors += errors
+        else:
+            for key, config in cities_to_process.items():
+                created, errors = ingest_city(key, config, args.dry_run, watermarks, args.full)
+                total_created += created
+                total_errors += errors
+    finally:
+        if isinstance(sys.stdout, CityOutputRouter):
+            sys.stdout = sys.stdout.stream
+        if transform_pool is not None:
+            transform_pool.shutdown()
 
     print(f"\n{'=' * 60}")
     print(f"Summary")